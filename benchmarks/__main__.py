@@ -0,0 +1,58 @@
+"""Run or compare frame loop benchmarks.
+
+    python -m benchmarks run --out bench.json
+    python -m benchmarks compare baseline.json bench.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.suite import compare, run_suite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the suite and write JSON results')
+    run.add_argument('--out', help='results file (default: stdout)')
+    run.add_argument('--quick', action='store_true', help='smallest sweep only')
+    run.add_argument('--number', type=int, default=20, help='calls per timing')
+    run.add_argument('--repeat', type=int, default=5, help='timings per case')
+    run.add_argument('--only', help='only run cases whose name contains this')
+
+    cmp = commands.add_parser('compare', help='flag regressions against a baseline')
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--threshold', type=float, default=0.1,
+                     help='allowed slowdown as a fraction (default 0.1 = 10%%)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_suite(args.quick, args.number, args.repeat, args.only,
+                            log=lambda line: print(line, file=sys.stderr))
+        output = json.dumps(results, indent=2)
+        if args.out:
+            with open(args.out, 'w') as f:
+                f.write(output)
+        else:
+            print(output)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    regressions = 0
+    for name, before, after, ratio, regressed in compare(baseline, current, args.threshold):
+        flag = 'REGRESSION' if regressed else ''
+        print('{:<70} {:>10.1f} {:>10.1f} {:>6.2f}x {}'.format(name, before, after, ratio, flag))
+        regressions += regressed
+    print('{} regression(s) over {:.0%}'.format(regressions, args.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""Benchmarks for the frame loop and its subsystems.
+
+Every case builds a fresh, seeded game state headlessly (SDL dummy
+drivers) and times a subsystem over it, so runs are repeatable on the
+same machine.
+"""
+import dataclasses
+import itertools
+import platform
+import random
+import statistics
+import time
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from config import get_config  # noqa: E402
+from src.formations import build_enemy_formation  # noqa: E402
+from src.game_meta import GameMeta  # noqa: E402
+from src.inputs import NO_INPUT, ScriptedInput  # noqa: E402
+from src.clock import SimulationClock  # noqa: E402
+from src.render import DirtyRectRenderer, FullRenderer  # noqa: E402
+from src.screen import ScreenHandler  # noqa: E402
+from src.screen_objects import Enemy, EnemyBullet, Player, PlayerBullet, ScoreBox  # noqa: E402
+from src.snapshot import restore_state, save_state  # noqa: E402
+from src.sprites import SPRITES  # noqa: E402
+
+FRAME_BUDGET_US = 1e6 / 60
+
+FORMATIONS = [(4, 10), (8, 20), (16, 40)]
+BULLET_COUNTS = [0, 50, 500]
+WINDOW_SIZES = [(500, 500), (1000, 1000)]
+
+QUICK_FORMATIONS = [(4, 10)]
+QUICK_BULLET_COUNTS = [0, 50]
+QUICK_WINDOW_SIZES = [(500, 500)]
+
+
+def game_config(window_size):
+    config = get_config()
+    width, height = window_size
+    return dataclasses.replace(
+        config, window=dataclasses.replace(config.window, width=width, height=height))
+
+
+def build_state(window=(500, 500), formation=(4, 10), bullets=0, seed=0, renderer_cls=None):
+    """A screen handler with a player, score box, formation and random bullets."""
+    config = game_config(window)
+    screen = pygame.display.set_mode(window)
+    SPRITES.use_display_format()
+
+    handler = ScreenHandler(
+        screen,
+        GameMeta(config.meta.start_lives, config.meta.start_points),
+        input_source=ScriptedInput(itertools.repeat(NO_INPUT)),
+        clock=SimulationClock(config.clock.step_ms, seed=seed),
+        sound=False,
+        config=config,
+    )
+    if renderer_cls is not None:
+        handler.renderer = renderer_cls(screen, handler.bg)
+
+    factory = handler.screen_object_factory
+    factory.create_score_box(config.scorebox.x, config.scorebox.y)
+    player_radius = config.player.radius
+    factory.create_player(
+        window[0] // 2,
+        config.play_field.bottom - player_radius,
+        config.player_vel,
+        player_radius,
+    )
+    if formation is not None:
+        nrows, ncols = formation
+        build_enemy_formation(handler, nrows=nrows, ncols=ncols)
+
+    rng = random.Random(seed)
+    field = config.play_field
+    for i in range(bullets):
+        x = rng.randint(field.left, field.right)
+        y = rng.randint(field.top, field.bottom)
+        if i % 2:
+            factory.create_enemy_bullet(x, y, config.enemy_bullet_vel, config.enemy.bullet.radius)
+        else:
+            factory.create_player_bullet(x, y, config.player_bullet_vel, config.player.bullet.radius)
+    return handler
+
+
+def time_case(setup, run, number, repeat):
+    """Per-call timings in microseconds, one per repeat, each from a fresh setup."""
+    timings = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            run(state)
+        timings.append(1e6 * (time.perf_counter() - start) / number)
+    return timings
+
+
+def summarise(timings, params):
+    return {
+        'params': params,
+        'median_us': statistics.median(timings),
+        'min_us': min(timings),
+        'max_us': max(timings),
+        'budget_pct': 100 * statistics.median(timings) / FRAME_BUDGET_US,
+    }
+
+
+def draw_all(screen_objects, cls):
+    for obj in screen_objects:
+        if isinstance(obj, cls):
+            obj.draw()
+
+
+def iter_cases(quick=False):
+    """Yield (name, params, setup, run) for every benchmark case."""
+    formations = QUICK_FORMATIONS if quick else FORMATIONS
+    bullet_counts = QUICK_BULLET_COUNTS if quick else BULLET_COUNTS
+    window_sizes = QUICK_WINDOW_SIZES if quick else WINDOW_SIZES
+    default_window = WINDOW_SIZES[0]
+
+    for window, formation, bullets in itertools.product(window_sizes, formations, bullet_counts):
+        params = {'window': window, 'formation': formation, 'bullets': bullets}
+        name = 'update_screen_state[{}x{},{}x{},{}]'.format(*window, *formation, bullets)
+        yield name, params, (lambda p=params: build_state(**p)), ScreenHandler.update_screen_state
+
+    for formation, bullets in itertools.product(formations, bullet_counts):
+        params = {'formation': formation, 'bullets': bullets}
+        setup = (lambda p=params: build_state(default_window, **p))
+        suffix = '[{}x{},{}]'.format(*formation, bullets)
+        yield ('handle_enemy_and_player_bullet_collisions' + suffix, params, setup,
+               ScreenHandler.handle_enemy_and_player_bullet_collisions)
+        yield ('handle_player_and_enemy_bullet_collisions' + suffix, params, setup,
+               ScreenHandler.handle_player_and_enemy_bullet_collisions)
+
+    for bullets in bullet_counts:
+        params = {'bullets': bullets}
+        yield ('cleanup_off_screen_objects[{}]'.format(bullets), params,
+               (lambda p=params: build_state(default_window, **p)),
+               ScreenHandler.cleanup_off_screen_objects)
+
+    for formation in formations:
+        params = {'formation': formation}
+        yield ('build_enemy_formation[{}x{}]'.format(*formation), params,
+               (lambda: build_state(default_window, formation=None)),
+               (lambda handler, f=formation: build_enemy_formation(handler, nrows=f[0], ncols=f[1])))
+
+    for formation in formations:
+        params = {'formation': formation, 'bullets': bullet_counts[-1]}
+        setup = (lambda p=params: build_state(default_window, **p))
+        yield 'save_state[{}x{}]'.format(*formation), params, setup, save_state
+
+        def restore_setup(p=params):
+            handler = build_state(default_window, **p)
+            return handler, save_state(handler)
+        yield ('restore_state[{}x{}]'.format(*formation), params, restore_setup,
+               (lambda state: restore_state(*state)))
+
+    for window in window_sizes:
+        params = {'window': window, 'formation': formations[-1], 'bullets': bullet_counts[-1]}
+        setup = (lambda p=params: build_state(**p))
+        for cls in (Player, Enemy, PlayerBullet, EnemyBullet):
+            yield ('draw[{},{}x{}]'.format(cls.__name__, *window), params, setup,
+                   (lambda handler, c=cls: draw_all(handler.screen_objects.values(), c)))
+
+        def score_box_setup(p=params):
+            handler = build_state(**p)
+            handler.update_screen_state()
+            return handler
+        yield ('draw[ScoreBox,{}x{}]'.format(*window), params, score_box_setup,
+               (lambda handler: draw_all(handler.screen_objects.values(), ScoreBox)))
+
+        for renderer_cls in (FullRenderer, DirtyRectRenderer):
+            def renderer_setup(p=params, r=renderer_cls):
+                return build_state(renderer_cls=r, **p)
+            yield ('render[{},{}x{}]'.format(renderer_cls.__name__, *window), params,
+                   renderer_setup, ScreenHandler.update_screen_state)
+
+
+def run_suite(quick=False, number=20, repeat=5, only=None, log=print):
+    pygame.init()
+    pygame.font.init()
+
+    results = {}
+    for name, params, setup, run in iter_cases(quick):
+        if only and only not in name:
+            continue
+        results[name] = summarise(time_case(setup, run, number, repeat), params)
+        log('{:<70} {:>12.1f} us'.format(name, results[name]['median_us']))
+
+    pygame.quit()
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'number': number,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """Return (name, baseline_us, current_us, ratio, regressed) for shared cases."""
+    rows = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['median_us']
+        after = result['median_us']
+        ratio = after / before if before else float('inf')
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
@@ -1,9 +1,14 @@
 import yaml
 from functools import lru_cache
 
+from config.schema import Config, ConfigError, compile_config  # noqa: F401
+
 
 @lru_cache  # cache means can't change config file mid game (which is ok)
-def get_config():
+def get_config() -> Config:
     with open('config/conf.yaml') as f:
-        config = yaml.safe_load(f)
-    return config
+        raw = yaml.safe_load(f)
+    try:
+        return compile_config(raw)
+    except ConfigError as e:
+        raise ConfigError(f"config/conf.yaml: {e}") from None
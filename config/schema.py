@@ -0,0 +1,281 @@
+"""Typed, validated form of conf.yaml.
+
+`compile_config` checks the raw YAML against the dataclasses below and
+returns a frozen Config. Values the game would otherwise work out every
+frame (the play-field bounds, the landing line, how far the player can
+move) are derived once when the Config is built.
+"""
+from dataclasses import MISSING, dataclass, field, fields
+import types
+import typing
+
+
+class ConfigError(ValueError):
+    """conf.yaml is missing a setting or has one of the wrong type or range."""
+
+
+def at_least(minimum, **kwargs):
+    return field(metadata={'min': minimum}, **kwargs)
+
+
+def between(minimum, maximum, **kwargs):
+    return field(metadata={'min': minimum, 'max': maximum}, **kwargs)
+
+
+def one_of(*choices, **kwargs):
+    return field(metadata={'choices': choices}, **kwargs)
+
+
+@dataclass(frozen=True, slots=True)
+class WindowConfig:
+    fps: int = at_least(1)
+    width: int = at_least(1)
+    height: int = at_least(1)
+    left_buffer: int = at_least(0)
+    right_buffer: int = at_least(0)
+    top_buffer: int = at_least(0)
+    bottom_buffer: int = at_least(0)
+    dirty_rects: bool = False
+    # how the game size above is shown: as is, scaled by SDL on the GPU,
+    # or scaled in software by a whole factor or smoothly to the display
+    scaling: str = one_of('none', 'gpu', 'integer', 'smooth', default='none')
+    display_width: typing.Optional[int] = at_least(1, default=None)
+    display_height: typing.Optional[int] = at_least(1, default=None)
+    fullscreen: bool = False
+    # delay: the fixed 50 ms delay per frame; precise: frames at fps, timed to
+    # the deadline with the last spin_ms busy-waited, running the clock steps due
+    pacing: str = one_of('delay', 'precise', default='delay')
+    spin_ms: int = at_least(0, default=1)
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def display_size(self):
+        """Requested display size, or None for the desktop (fullscreen) or game size."""
+        if self.display_width is None:
+            return None
+        return self.display_width, self.display_height
+
+
+# player and bullet speeds are given in pixels per this much game time
+SPEED_UNIT_MS = 50
+
+
+def per_tick(speed, step_ms):
+    """Pixels moved per tick of `step_ms` at `speed` pixels per SPEED_UNIT_MS.
+
+    Stays an int whenever the step divides evenly, so the default 50 ms
+    step keeps whole-pixel positions.
+    """
+    distance = speed * step_ms
+    if distance % SPEED_UNIT_MS == 0:
+        return distance // SPEED_UNIT_MS
+    return distance / SPEED_UNIT_MS
+
+
+@dataclass(frozen=True, slots=True)
+class ClockConfig:
+    step_ms: int = at_least(1)
+    seed: typing.Optional[int] = between(0, 2**64 - 1, default=None)  # stored unsigned in recordings
+
+
+@dataclass(frozen=True, slots=True)
+class BulletConfig:
+    speed: int = at_least(1)
+    radius: int = at_least(1)
+    recoil: int = at_least(0)
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerConfig:
+    vel: int = at_least(0)
+    radius: int = at_least(1)
+    bullet: BulletConfig
+
+
+@dataclass(frozen=True, slots=True)
+class EnemyConfig:
+    standard_point_value: int = at_least(0)
+    shooter_point_value: int = at_least(0)
+    shooting_frequency: float = at_least(0)
+    speed: int = at_least(0)
+    radius: int = at_least(1)
+    move_recoil: int = at_least(0)
+    bullet: BulletConfig
+
+
+@dataclass(frozen=True, slots=True)
+class FormationConfig:
+    nrows: int = at_least(1)
+    ncols: int = at_least(1)
+
+
+@dataclass(frozen=True, slots=True)
+class WavesConfig:
+    formations: typing.Tuple[FormationConfig, ...]
+    endless: bool = False
+    delay: int = at_least(0, default=0)
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreboxConfig:
+    x: int
+    y: int
+
+
+@dataclass(frozen=True, slots=True)
+class MetaConfig:
+    start_lives: int = at_least(1)
+    start_points: int = at_least(0)
+
+
+@dataclass(frozen=True, slots=True)
+class EntityStoreConfig:
+    enabled: bool = False
+    capacity: int = at_least(1, default=256)
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureConfig:
+    enabled: bool = False
+    directory: str = 'capture'
+    format: str = one_of('png', 'raw', default='png')
+    buffers: int = at_least(1, default=8)
+    workers: int = at_least(1, default=2)
+
+
+@dataclass(frozen=True, slots=True)
+class ProfilerConfig:
+    enabled: bool = False
+    overlay: bool = True
+    trace_file: str = 'frame_trace.json'
+
+
+@dataclass(frozen=True, slots=True)
+class PlayField:
+    """The part of the window inside the buffers, in window coordinates."""
+    left: int
+    right: int
+    top: int
+    bottom: int
+
+    def contains(self, x, y):
+        return self.left <= x <= self.right and self.top <= y <= self.bottom
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    window: WindowConfig
+    clock: ClockConfig
+    player: PlayerConfig
+    enemy: EnemyConfig
+    waves: WavesConfig
+    scorebox: ScoreboxConfig
+    meta: MetaConfig
+    entity_store: EntityStoreConfig = EntityStoreConfig()
+    profiler: ProfilerConfig = ProfilerConfig()
+    capture: CaptureConfig = CaptureConfig()
+
+    # derived in __post_init__
+    play_field: PlayField = field(init=False)
+    landing_y: int = field(init=False)  # enemies below this line have landed
+    player_min_x: int = field(init=False)
+    player_max_x: int = field(init=False)
+    # per-tick speeds, so the game plays at the same pace whatever clock.step_ms is
+    player_vel: float = field(init=False)
+    player_bullet_vel: float = field(init=False)
+    enemy_bullet_vel: float = field(init=False)
+
+    def __post_init__(self):
+        window = self.window
+        play_field = PlayField(
+            left=window.left_buffer,
+            right=window.width - window.right_buffer,
+            top=window.top_buffer,
+            bottom=window.height - window.bottom_buffer,
+        )
+        if play_field.left >= play_field.right or play_field.top >= play_field.bottom:
+            raise ConfigError("window: buffers leave no room for the play field")
+        if (window.display_width is None) != (window.display_height is None):
+            raise ConfigError("window: set both display_width and display_height, or neither")
+        if play_field.right - play_field.left < 2 * self.player.radius:
+            raise ConfigError("player.radius: player does not fit between the side buffers")
+
+        object.__setattr__(self, 'play_field', play_field)
+        object.__setattr__(self, 'landing_y', play_field.bottom)
+        object.__setattr__(self, 'player_min_x', play_field.left + self.player.radius)
+        object.__setattr__(self, 'player_max_x', play_field.right - self.player.radius)
+        step_ms = self.clock.step_ms
+        object.__setattr__(self, 'player_vel', per_tick(self.player.vel, step_ms))
+        object.__setattr__(self, 'player_bullet_vel', per_tick(self.player.bullet.speed, step_ms))
+        object.__setattr__(self, 'enemy_bullet_vel', per_tick(self.enemy.bullet.speed, step_ms))
+
+
+def _type_name(tp):
+    return getattr(tp, '__name__', str(tp))
+
+
+def _convert(tp, value, path):
+    origin = typing.get_origin(tp)
+    if origin in (typing.Union, types.UnionType):
+        if value is None and type(None) in typing.get_args(tp):
+            return None
+        tp = next(arg for arg in typing.get_args(tp) if arg is not type(None))
+        return _convert(tp, value, path)
+    if origin is tuple:
+        if not isinstance(value, list) or not value:
+            raise ConfigError(f"{path}: expected a non-empty list, got {value!r}")
+        item_tp = typing.get_args(tp)[0]
+        return tuple(_convert(item_tp, item, f"{path}[{i}]") for i, item in enumerate(value))
+    if hasattr(tp, '__dataclass_fields__'):
+        return _build(tp, value, path)
+
+    # bool is an int subclass, so check it separately; ints are fine for floats
+    if tp is bool:
+        ok = isinstance(value, bool)
+    elif tp is float:
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+        value = float(value) if ok else value
+    else:
+        ok = isinstance(value, tp) and not isinstance(value, bool)
+    if not ok:
+        raise ConfigError(f"{path}: expected {_type_name(tp)}, got {value!r}")
+    return value
+
+
+def _build(cls, data, path=''):
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path or 'config'}: expected a mapping, got {data!r}")
+
+    hints = typing.get_type_hints(cls)
+    init_fields = [f for f in fields(cls) if f.init]
+    unknown = set(data) - {f.name for f in init_fields}
+    if unknown:
+        raise ConfigError(f"{path or 'config'}: unknown setting(s) {', '.join(sorted(unknown))}")
+
+    kwargs = {}
+    for f in init_fields:
+        key = f'{path}.{f.name}' if path else f.name
+        if f.name not in data:
+            if f.default is MISSING and f.default_factory is MISSING:
+                raise ConfigError(f"{key}: missing")
+            continue
+        value = _convert(hints[f.name], data[f.name], key)
+        minimum = f.metadata.get('min')
+        if minimum is not None and value is not None and value < minimum:
+            raise ConfigError(f"{key}: must be at least {minimum}, got {value!r}")
+        maximum = f.metadata.get('max')
+        if maximum is not None and value is not None and value > maximum:
+            raise ConfigError(f"{key}: must be at most {maximum}, got {value!r}")
+        choices = f.metadata.get('choices')
+        if choices is not None and value not in choices:
+            raise ConfigError(f"{key}: must be one of {', '.join(choices)}, got {value!r}")
+        kwargs[f.name] = value
+    return cls(**kwargs)
+
+
+def compile_config(raw) -> Config:
+    """Validate the parsed YAML and build the Config, raising ConfigError."""
+    return _build(Config, raw)
@@ -1,6 +1,34 @@
+import argparse
+
 from src.game import Game
+from src.inputs import InputLog
 
 
 if __name__ == '__main__':
-    Game().play()
-    print('Thanks for playing!')
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--record', metavar='FILE', help='save your inputs to FILE')
+    parser.add_argument('--replay', metavar='FILE', help='watch a recorded game')
+    parser.add_argument('--seek', type=int, default=0, metavar='TICK',
+                        help='fast-forward a replay to TICK before showing it')
+    parser.add_argument('--capture', metavar='DIR',
+                        help='save the frames of the game or replay to DIR')
+    parser.add_argument('--headless', action='store_true',
+                        help='replay without a window, e.g. to --capture footage in CI')
+    parser.add_argument('--latency', action='store_true',
+                        help='print time to first frame and input-to-present latency on exit')
+    args = parser.parse_args()
+
+    if args.replay:
+        Game(headless=args.headless).replay(
+            InputLog.load(args.replay), seek_tick=args.seek, watch=not args.headless,
+            capture_dir=args.capture)
+    else:
+        game = Game()
+        game.play(record_path=args.record, capture_dir=args.capture)
+        print('Thanks for playing!')
+        if args.latency:
+            print(f"Time to first frame: {game.metrics['time_to_first_frame_ms']:.1f} ms")
+            labels = {'latency': 'Input sample to present', 'interval': 'Time between input samples'}
+            for name, percentiles in game.metrics['input_latency_ms'].items():
+                print(f'{labels[name]}: ' + ', '.join(
+                    f'{p} {ms:.1f} ms' for p, ms in percentiles.items()))
@@ -0,0 +1,31 @@
+"""Run a multiplayer game server on localhost, e.g.
+
+    python server.py --port 5555
+
+Clients connect with src.net.GameClient(('127.0.0.1', 5555)).
+"""
+import argparse
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()  # the server never opens a window
+
+from src.net import GameServer  # noqa: E402
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5555)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--max-clients', type=int, default=4)
+    args = parser.parse_args()
+
+    server = GameServer((args.host, args.port), seed=args.seed, max_clients=args.max_clients)
+    print('Serving on {}:{}'.format(*server.address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -0,0 +1,35 @@
+"""Run headless games with random input, e.g. for balance testing.
+
+    python simulate.py --games 100 --ticks 5000
+"""
+import argparse
+import random
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()  # must happen before the game modules touch SDL
+
+from src.game import Game  # noqa: E402
+from src.inputs import InputState, ScriptedInput  # noqa: E402
+
+
+def random_inputs(rng, ticks):
+    for _ in range(ticks):
+        yield InputState(rng.random() < 0.3, rng.random() < 0.3, rng.random() < 0.5)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--ticks', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    game = Game(headless=True)
+    wins = 0
+    for i in range(args.games):
+        meta = game.simulate(ScriptedInput(random_inputs(rng, args.ticks)), seed=args.seed + i)
+        wins += meta.won_state
+        print(f'points={meta.points} lives={meta.lives} won={meta.won_state}')
+    print(f'{wins}/{args.games} games won')
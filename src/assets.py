@@ -0,0 +1,81 @@
+import os
+import threading
+
+import pygame
+
+
+IMAGE_FILES = {
+    'background': os.path.join('data', 'images', 'background.jpg'),
+    'red_invader': os.path.join('data', 'images', 'invaders-red.png'),
+    'yellow_invader': os.path.join('data', 'images', 'invaders-yellow.gif'),
+}
+
+# name -> (file, volume). Sounds sharing a file and volume share one Sound.
+# Keep shoot sounds separate as likely will to change them to different
+# sounds down the line
+SOUND_FILES = {
+    'explosion': (os.path.join('data', 'sounds', 'explosion.wav'), 0.2),
+    'hurt': (os.path.join('data', 'sounds', 'beep.wav'), 4),
+    'player_shoot': (os.path.join('data', 'sounds', 'shoot-sound.wav'), 4),
+    'enemy_shoot': (os.path.join('data', 'sounds', 'shoot-sound.wav'), 4),
+}
+
+MUSIC_FILE = os.path.join('data', 'sounds', 'main_music.mp3')
+
+
+class AssetManager:
+    """Loads images and sounds the first time they are asked for.
+
+    Nothing is read from disk on import, so headless runs and tests only
+    pay for what they use. `preload_in_background` warms the cache on a
+    worker thread, e.g. while the home screen is showing.
+    """
+
+    def __init__(self):
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.preload_thread = None
+
+    def image(self, name: str) -> pygame.Surface:
+        path = IMAGE_FILES[name]
+        return self._get(path, lambda: pygame.image.load(path))
+
+    def sound(self, name: str) -> pygame.mixer.Sound:
+        path, volume = SOUND_FILES[name]
+        return self._get((path, volume), lambda: self._load_sound(path, volume))
+
+    def _get(self, key, load):
+        asset = self.cache.get(key)
+        if asset is None:
+            with self.lock:
+                asset = self.cache.get(key)
+                if asset is None:
+                    asset = self.cache[key] = load()
+        return asset
+
+    def _load_sound(self, path, volume):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        sound = pygame.mixer.Sound(path)
+        sound.set_volume(volume)
+        return sound
+
+    def preload(self, sounds=True):
+        for name in IMAGE_FILES:
+            self.image(name)
+        if sounds:
+            for name in SOUND_FILES:
+                self.sound(name)
+
+    def preload_in_background(self, sounds=True):
+        if self.preload_thread is None:
+            self.preload_thread = threading.Thread(
+                target=self.preload, kwargs={'sounds': sounds}, daemon=True)
+            self.preload_thread.start()
+
+    def wait_for_preload(self):
+        if self.preload_thread is not None:
+            self.preload_thread.join()
+
+
+ASSETS = AssetManager()
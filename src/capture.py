@@ -0,0 +1,92 @@
+"""Record presented frames to disk without holding up the game loop.
+
+`FrameCapture.capture(surface)` copies the frame into one of a fixed ring
+of surfaces (a single blit) and hands it to a thread pool that encodes
+it. When every buffer is still waiting for an encoder the frame is
+dropped and counted in `dropped` instead of waiting, unless the capture
+was made with `block=True`, for offline renders that must keep every
+frame.
+
+Formats:
+
+    png  numbered frame_000000.png files in the output directory
+    raw  one frames.rgb file of packed RGB24 frames, which ffmpeg reads with
+         -f rawvideo -pix_fmt rgb24 -s WIDTHxHEIGHT -r FPS -i frames.rgb
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import queue
+import threading
+
+import pygame
+
+FORMATS = ('png', 'raw')
+
+
+class FrameCapture:
+    def __init__(self, directory, size, format='png', buffers=8, workers=2, block=False):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown capture format {format!r}, expected one of {FORMATS}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.size = size
+        self.format = format
+        self.block = block
+        self.free = queue.Queue()
+        for _ in range(buffers):
+            self.free.put(pygame.Surface(size))
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='capture')
+        self.frame_count = 0
+        self.dropped = 0
+        self.errors = []
+        self.raw_file = None
+        self.raw_lock = threading.Lock()
+        if format == 'raw':
+            self.raw_file = open(os.path.join(directory, 'frames.rgb'), 'wb')
+            self.frame_bytes = 3 * size[0] * size[1]
+
+    def capture(self, surface: pygame.Surface) -> bool:
+        """Queue a copy of `surface` for encoding. Returns False if the frame was dropped."""
+        try:
+            buffer = self.free.get(block=self.block)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        buffer.blit(surface, (0, 0))
+        self.pool.submit(self.encode, buffer, self.frame_count)
+        self.frame_count += 1
+        return True
+
+    def encode(self, buffer, index):
+        try:
+            if self.format == 'png':
+                pygame.image.save(buffer, os.path.join(self.directory, f'frame_{index:06d}.png'))
+            else:
+                data = pygame.image.tobytes(buffer, 'RGB')
+                # frames can finish out of order, so each goes to its own slot
+                with self.raw_lock:
+                    self.raw_file.seek(index * self.frame_bytes)
+                    self.raw_file.write(data)
+        except Exception as e:  # keep the pool alive, report at close
+            self.errors.append(e)
+        finally:
+            self.free.put(buffer)
+
+    def finish(self):
+        """Wait for queued frames to be written, keeping any encoding errors for `close`."""
+        self.pool.shutdown(wait=True)
+        if self.raw_file is not None:
+            self.raw_file.close()
+
+    def close(self):
+        """Finish writing. Raises the first encoding error, if any."""
+        self.finish()
+        if self.errors:
+            raise self.errors[0]
+
+
+def create_frame_capture(config, directory=None, block=False):
+    """FrameCapture set up from the `capture` config section, writing to `directory`."""
+    capture = config.capture
+    return FrameCapture(directory or capture.directory, config.window.size, format=capture.format,
+                        buffers=capture.buffers, workers=capture.workers, block=block)
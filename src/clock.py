@@ -0,0 +1,30 @@
+import random
+
+
+class SimulationClock:
+    """Fixed-timestep game clock with its own seeded random generator.
+
+    Time only moves forward when `tick` is called, by `step_ms` each
+    time, so a game replays identically for the same seed and input no
+    matter how fast the frames are actually rendered.
+    """
+
+    def __init__(self, step_ms: int, seed: int = None):
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.step_ms = step_ms
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.time = 0
+        self.tick_count = 0
+
+    def tick(self):
+        self.time += self.step_ms
+        self.tick_count += 1
+
+    def get_ticks(self):
+        """Milliseconds of game time elapsed, like pygame.time.get_ticks."""
+        return self.time
+
+    def random(self):
+        return self.rng.random()
@@ -0,0 +1,108 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only needed when the store is enabled
+    np = None
+
+
+# Type tags stored per slot
+EMPTY = 0
+PLAYER_BULLET = 1
+ENEMY_BULLET = 2
+
+
+class EntityStore:
+    """Struct-of-arrays storage for entity state.
+
+    Each entity owns a slot index into parallel numpy arrays of position,
+    speed, vertical heading, radius, type tag and alive flag. Objects
+    read and write their fields through StoreColumn descriptors, and
+    `step` moves every live entity in one vectorised operation.
+    """
+
+    COLUMNS = {
+        'x': 'float64',  # sub-pixel once speeds are scaled to a short clock step
+        'y': 'float64',
+        'vel': 'float64',
+        'heading': 'int8',
+        'radius': 'int16',
+        'kind': 'uint8',
+        'alive': 'bool',
+    }
+
+    def __init__(self, capacity=256):
+        if np is None:
+            raise ImportError('EntityStore requires numpy')
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype) for name, dtype in self.COLUMNS.items()}
+        self.entities = [None] * capacity
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.size = 0  # one past the highest slot ever used
+
+    def __getattr__(self, name):
+        # expose the columns as attributes, e.g. store.x
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def allocate(self, entity, kind: int) -> int:
+        if not self.free_slots:
+            self.grow()
+        slot = self.free_slots.pop()
+        self.entities[slot] = entity
+        self.columns['kind'][slot] = kind
+        self.columns['alive'][slot] = True
+        self.size = max(self.size, slot + 1)
+        return slot
+
+    def deactivate(self, slot: int):
+        """Stop the entity in `slot` without giving the slot up."""
+        self.columns['alive'][slot] = False
+        self.columns['heading'][slot] = 0
+
+    def activate(self, slot: int, heading: int):
+        self.columns['alive'][slot] = True
+        self.columns['heading'][slot] = heading
+
+    def free(self, slot: int):
+        self.deactivate(slot)
+        self.columns['kind'][slot] = EMPTY
+        self.entities[slot] = None
+        self.free_slots.append(slot)
+
+    def grow(self):
+        old = self.capacity
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            self.columns[name] = np.concatenate([column, np.zeros(old, column.dtype)])
+        self.entities.extend([None] * old)
+        self.free_slots.extend(range(self.capacity - 1, old - 1, -1))
+
+    def step(self):
+        """Move every live entity by its speed along its heading."""
+        n = self.size
+        self.columns['y'][:n] += self.columns['vel'][:n] * self.columns['heading'][:n]
+
+    def offscreen(self, min_x: int, max_x: int, min_y: int, max_y: int):
+        """Live entities whose centre is outside the given bounds."""
+        n = self.size
+        x = self.columns['x'][:n]
+        y = self.columns['y'][:n]
+        outside = (y > max_y) | (y < min_y) | (x > max_x) | (x < min_x)
+        slots = np.flatnonzero(outside & self.columns['alive'][:n])
+        return [self.entities[slot] for slot in slots]
+
+
+class StoreColumn:
+    """Descriptor mapping an attribute to the object's slot in a store column."""
+
+    def __init__(self, column: str):
+        self.column = column
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.store.columns[self.column][obj.slot].item()
+
+    def __set__(self, obj, value):
+        obj.store.columns[self.column][obj.slot] = value
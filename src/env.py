@@ -0,0 +1,245 @@
+"""Reinforcement-learning style environments around the headless game.
+
+`SpaceInvadersEnv` has the usual `reset()` / `step(action)` interface.
+Actions are input masks (see src/inputs.py): any combination of LEFT,
+RIGHT and SHOOT, so 0-7. The observation is a fixed-size float32 array:
+
+    [player present, player x, player y, lives]
+    then (present, x, y) for up to MAX_ENEMIES enemies,
+    MAX_BULLETS player bullets and MAX_BULLETS enemy bullets
+
+with positions scaled to 0-1 by the window size and unused slots zero.
+The reward is the change in points over the step.
+
+`VectorEnv` steps many environments at once in worker processes, which
+write their observations straight into one shared-memory array.
+"""
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only needed for the environments
+    np = None
+
+import pygame
+
+from src.game import Game
+from src.helpers import use_dummy_drivers
+from src.inputs import mask_to_input, NO_INPUT
+
+MAX_ENEMIES = 64
+MAX_BULLETS = 16
+
+PLAYER_FIELDS = 4
+OBS_SIZE = PLAYER_FIELDS + 3 * (MAX_ENEMIES + 2 * MAX_BULLETS)
+NUM_ACTIONS = 8
+
+ACTIONS = tuple(mask_to_input(mask) for mask in range(NUM_ACTIONS))
+
+
+class ActionInput:
+    """Input source that returns whatever action the environment last set."""
+
+    exhausted = False
+
+    def __init__(self):
+        self.state = NO_INPUT
+
+    def read(self):
+        return self.state
+
+
+class SpaceInvadersEnv:
+    """One headless game stepped a tick at a time.
+
+    An episode ends when the game is won or lost, or after `max_ticks`
+    steps if that is set.
+    """
+
+    def __init__(self, max_ticks=None, seed=None):
+        if np is None:
+            raise ImportError('SpaceInvadersEnv requires numpy')
+        use_dummy_drivers()  # environments never open a window
+        self.max_ticks = max_ticks
+        self.seed = seed
+        self.game = Game(headless=True)
+        self.screen = pygame.Surface(self.game.config.window.size)
+        self.input = ActionInput()
+        self.screen_handler = None
+        self.ticks = 0
+        self.points = 0
+
+    def reset(self, seed=None, out=None):
+        """Start a new episode and return its first observation.
+
+        Without a seed, episodes after the first continue from the last
+        one's RNG so a seeded env still produces varied games.
+        """
+        if seed is None and self.screen_handler is not None:
+            seed = self.screen_handler.clock.rng.getrandbits(64)
+        elif seed is None:
+            seed = self.seed
+        self.input.state = NO_INPUT
+        self.screen_handler = self.game.start_simulation(self.screen, self.input, seed)
+        self.ticks = 0
+        self.points = self.game.game_meta.points
+        return self.observe(out)
+
+    def step(self, action: int, out=None):
+        """Advance one tick. Returns (observation, reward, done, info)."""
+        self.input.state = ACTIONS[action]
+        self.screen_handler.update_screen_state()
+        self.ticks += 1
+
+        game_meta = self.game.game_meta
+        end_message = self.game.check_game_over(self.screen_handler)
+        truncated = self.max_ticks is not None and self.ticks >= self.max_ticks
+        reward = game_meta.points - self.points
+        self.points = game_meta.points
+        info = {
+            'points': game_meta.points,
+            'lives': game_meta.lives,
+            'won': game_meta.won_state,
+            'ticks': self.ticks,
+            'truncated': truncated and not end_message,
+        }
+        return self.observe(out), reward, bool(end_message) or truncated, info
+
+    def observe(self, out=None):
+        """Fill `out` (or a new array) with the current observation."""
+        if out is None:
+            out = np.zeros(OBS_SIZE, np.float32)
+        else:
+            out[:] = 0
+        sh = self.screen_handler
+        width, height = self.screen.get_size()
+
+        for player in sh.players:
+            out[:PLAYER_FIELDS] = (1, player.x / width, player.y / height, self.game.game_meta.lives)
+            break
+
+        start = PLAYER_FIELDS
+        for objects, limit in ((sh.enemies, MAX_ENEMIES),
+                               (sh.player_bullets, MAX_BULLETS),
+                               (sh.enemy_bullets, MAX_BULLETS)):
+            slots = out[start:start + 3 * limit].reshape(limit, 3)
+            for slot, obj in zip(slots, objects):
+                slot[:] = (1, obj.x / width, obj.y / height)
+            start += 3 * limit
+        return out
+
+
+def run_worker(conn, shm_name, num_envs, first, count, env_kwargs):
+    """Own envs [first, first + count) and serve commands from the parent."""
+    use_dummy_drivers()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    observations = np.ndarray((num_envs, OBS_SIZE), np.float32, buffer=shm.buf)
+    envs = [SpaceInvadersEnv(**env_kwargs) for _ in range(count)]
+    try:
+        while True:
+            command, data = conn.recv()
+            if command == 'reset':
+                for i, (env, seed) in enumerate(zip(envs, data)):
+                    env.reset(seed, out=observations[first + i])
+                conn.send(None)
+            elif command == 'step':
+                results = []
+                for i, (env, action) in enumerate(zip(envs, data)):
+                    obs = observations[first + i]
+                    _, reward, done, info = env.step(action, out=obs)
+                    if done:
+                        env.reset(out=obs)  # the observation starts the next episode
+                    results.append((reward, done, info))
+                conn.send(results)
+            elif command == 'close':
+                break
+    finally:
+        del observations
+        shm.close()
+        conn.close()
+
+
+class VectorEnv:
+    """`num_envs` environments stepped together across worker processes.
+
+    `step` takes one action per environment and returns stacked
+    (observations, rewards, dones, infos). Environments that finish are
+    reset straight away, so the returned observation for a done env is
+    the first of its next episode. The observations array is a view of
+    shared memory that the next call overwrites; copy it to keep it.
+    """
+
+    def __init__(self, num_envs, processes=None, context='spawn', **env_kwargs):
+        if np is None:
+            raise ImportError('VectorEnv requires numpy')
+        processes = min(num_envs, processes or mp.cpu_count())
+        ctx = mp.get_context(context)
+
+        self.num_envs = num_envs
+        self.shm = shared_memory.SharedMemory(create=True, size=num_envs * OBS_SIZE * 4)
+        self.observations = np.ndarray((num_envs, OBS_SIZE), np.float32, buffer=self.shm.buf)
+        self.observations[:] = 0
+
+        self.workers = []
+        self.connections = []
+        self.chunks = []
+        per_worker, extra = divmod(num_envs, processes)
+        first = 0
+        for i in range(processes):
+            count = per_worker + (i < extra)
+            parent_conn, child_conn = ctx.Pipe()
+            worker = ctx.Process(
+                target=run_worker,
+                args=(child_conn, self.shm.name, num_envs, first, count, env_kwargs),
+                daemon=True,
+            )
+            worker.start()
+            child_conn.close()
+            self.workers.append(worker)
+            self.connections.append(parent_conn)
+            self.chunks.append(slice(first, first + count))
+            first += count
+        self.closed = False
+
+    def reset(self, seeds=None):
+        if seeds is None:
+            seeds = [None] * self.num_envs
+        for conn, chunk in zip(self.connections, self.chunks):
+            conn.send(('reset', list(seeds[chunk])))
+        for conn in self.connections:
+            conn.recv()
+        return self.observations
+
+    def step(self, actions):
+        actions = [int(action) for action in actions]
+        for conn, chunk in zip(self.connections, self.chunks):
+            conn.send(('step', actions[chunk]))
+        results = [result for conn in self.connections for result in conn.recv()]
+        rewards = np.array([reward for reward, _, _ in results], np.float32)
+        dones = np.array([done for _, done, _ in results], bool)
+        infos = [info for _, _, info in results]
+        return self.observations, rewards, dones, infos
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self.connections:
+            try:
+                conn.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        del self.observations
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
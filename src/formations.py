@@ -1,3 +1,5 @@
+from collections import Counter
+from functools import lru_cache
 
 
 def build_formation_grid(radius, left_buffer, top_buffer, nrows, ncols,
@@ -17,23 +19,107 @@ def build_formation_grid(radius, left_buffer, top_buffer, nrows, ncols,
     return grid
 
 
-def calc_move_counter_level(grid, radius, velocity, right_buffer, width, **kwargs):
-    max_allowed_x_on_screen = width - right_buffer
-    max_point_in_grid = max(x for x, y in grid) + radius
-    return (max_allowed_x_on_screen - max_point_in_grid) // velocity
+class Formation:
+    """A block of enemies that moves as one.
 
+    Enemies keep their position relative to the formation, so a move is a
+    single change to the shared offset. The formation turns and drops a
+    row when its surviving outermost column would cross the play area
+    edge.
+    """
 
-def build_enemy_formation(screen_handler, nrows=4, ncols=10, **config):
-    vel = config['enemy']['speed']
-    r = config['enemy']['radius']
-    grid = build_formation_grid(nrows=nrows, ncols=ncols, **config['window'], **config['enemy'])
-    move_counter_level = calc_move_counter_level(
-        grid=grid, velocity=vel, **config['enemy'], **config['window'])
+    def __init__(self, vel: int, radius: int, min_x: int, max_x: int, move_recoil: int):
+        self.id = None  # set when registered with a ScreenHandler
+        self.offset_x = 0
+        self.offset_y = 0
+        self.direction = 1
+        self.vel = vel
+        self.radius = radius
+        self.min_x = min_x
+        self.max_x = max_x
+        self.move_recoil = move_recoil
+        self.last_move_time = 0
+        self.timer = None
+        self.enemies = {}
+        # alive enemies per column x / row y, relative to the formation
+        self.column_counts = Counter()
+        self.row_counts = Counter()
+
+    def add(self, enemy):
+        enemy.formation = self
+        self.enemies[enemy.id] = enemy
+        self.column_counts[enemy.grid_x] += 1
+        self.row_counts[enemy.grid_y] += 1
+
+    def remove(self, enemy):
+        del self.enemies[enemy.id]
+        for counts, key in ((self.column_counts, enemy.grid_x), (self.row_counts, enemy.grid_y)):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+
+    @property
+    def left_edge(self):
+        return self.offset_x + min(self.column_counts) - self.radius
+
+    @property
+    def right_edge(self):
+        return self.offset_x + max(self.column_counts) + self.radius
+
+    @property
+    def lowest_y(self):
+        """Centre y of the lowest surviving row."""
+        return self.offset_y + max(self.row_counts)
+
+    def update_state(self, screen_handler):
+        """Move now and book the next move. Run by the handler's timers."""
+        self.last_move_time = screen_handler.clock.get_ticks()
+        self.move()
+        self.schedule_move(screen_handler)
+
+    def schedule_move(self, screen_handler):
+        self.timer = screen_handler.timers.schedule(
+            self.last_move_time + self.move_recoil, self.update_state, screen_handler)
+
+    def move(self):
+        if not self.enemies:
+            return
+
+        step = self.direction * self.vel
+        if self.left_edge + step < self.min_x or self.right_edge + step > self.max_x:
+            self.offset_y += self.vel  # move down
+            self.direction *= -1  # switch direction
+        else:
+            self.offset_x += step
+
+
+@lru_cache(maxsize=64)
+def compile_formation_template(nrows, ncols, radius, left_buffer, top_buffer):
+    """Grid positions and front row y of a formation, cached per geometry."""
+    grid = tuple(build_formation_grid(radius, left_buffer, top_buffer, nrows, ncols))
     first_layer_y = min([y for x, y in grid])
+    return grid, first_layer_y
+
+
+def build_enemy_formation(screen_handler, nrows=4, ncols=10):
+    config = screen_handler.config
+    vel = config.enemy.speed
+    r = config.enemy.radius
+    grid, first_layer_y = compile_formation_template(
+        nrows, ncols, r, config.play_field.left, config.play_field.top)
+    formation = Formation(
+        vel=vel,
+        radius=r,
+        min_x=config.play_field.left,
+        max_x=config.play_field.right,
+        move_recoil=config.enemy.move_recoil,
+    )
+    screen_handler.register_formation(formation)
+
     for x, y in grid:
         if y == first_layer_y:
             enemy = screen_handler.screen_object_factory.create_shooting_enemy(x, y, vel, r)
-            enemy.set_move_counter_max_level(move_counter_level)
         else:
             enemy = screen_handler.screen_object_factory.create_standard_enemy(x, y, vel, r)
-            enemy.set_move_counter_max_level(move_counter_level)
+        formation.add(enemy)
+    return formation
@@ -1,37 +1,82 @@
+import time
+
 import pygame
 
 from config import get_config
+from src.assets import ASSETS, MUSIC_FILE
+from src.capture import create_frame_capture
+from src.clock import SimulationClock
 from src.game_meta import GameMeta
+from src.inputs import InputLog, InputRecorder, KeyboardInput, RecordedInput
+from src.pacing import FixedStep, FramePacer, LatencyTracker
+from src.profiler import create_profiler
+from src.render import ScaledRenderer
+from src.helpers import use_dummy_drivers
 
 from src.screen import ScreenHandler
-from src.formations import build_enemy_formation
+from src.sprites import SPRITES
+from src.waves import WaveScheduler, iter_waves
 
 
 class Game:
-    def __init__(self, fps=60):
+    def __init__(self, fps=60, headless=False):
+        self.start_time = time.perf_counter()
+        self.metrics = {}
+        self.headless = headless
+        if headless:
+            use_dummy_drivers()
         pygame.init()
         pygame.font.init()
         self.clock = pygame.time.Clock()
         self.config = get_config()
-        pygame.mixer.music.load('data/sounds/main_music.mp3')
+
+    def start_music(self):
+        pygame.mixer.music.load(MUSIC_FILE)
         pygame.mixer.music.play(loops=-1)
         pygame.mixer.music.set_volume(0.25)
 
     def create_screen(self):
-        window = pygame.display.set_mode(
-            (self.config['window']['width'], self.config['window']['height'])
-        )
+        """Open the window and return the surface the game draws on.
+
+        Unless scaling in software that is the display itself. Otherwise
+        the game draws on a surface of the configured game size and the
+        renderer scales it to the display (see `use_display`).
+        """
+        window = self.config.window
+        flags = pygame.FULLSCREEN if window.fullscreen else 0
+        if window.scaling in ('none', 'gpu'):
+            if window.scaling == 'gpu':
+                flags |= pygame.SCALED
+            self.display = pygame.display.set_mode(window.size, flags)
+            screen = self.display
+        else:
+            display_size = window.display_size or ((0, 0) if window.fullscreen else window.size)
+            self.display = pygame.display.set_mode(display_size, flags)
+            screen = pygame.Surface(window.size).convert()
         pygame.display.set_caption("Game!")
-        return window
+        SPRITES.use_display_format()
+        return screen
+
+    def use_display(self, screen_handler: ScreenHandler):
+        """Make the handler's renderer scale its frames up to the display if needed."""
+        if screen_handler.screen is not self.display:
+            screen_handler.renderer = ScaledRenderer(
+                screen_handler.renderer, self.display,
+                smooth=self.config.window.scaling == 'smooth', profiler=screen_handler.profiler)
 
     def prepare_game_screen(self, screen_handler: ScreenHandler):
         self.build_score_box(screen_handler)
         self.build_player(screen_handler)
-        self.build_enemy_formation(screen_handler)
+        self.build_enemy_waves(screen_handler)
 
     def show_home_screen(self, screen_handler: ScreenHandler):
         home_screen = screen_handler.display_home_screen()
-        pygame.display.update()
+        screen_handler.renderer.present()
+        self.metrics['time_to_first_frame_ms'] = 1000 * (time.perf_counter() - self.start_time)
+
+        # load the game assets while waiting for the player
+        ASSETS.preload_in_background()
+
         running = True
         while running:
             pygame.time.delay(50)
@@ -44,62 +89,230 @@ class Game:
         screen_handler.remove_screen_object(home_screen)
 
     def build_score_box(self, screen_handler: ScreenHandler):
-        screen_handler.screen_object_factory.create_score_box(**self.config['scorebox'])
+        screen_handler.screen_object_factory.create_score_box(self.config.scorebox.x, self.config.scorebox.y)
 
-    def build_enemy_formation(self, screen_handler: ScreenHandler):
-        # TODO - put the formation logic here now?
-        build_enemy_formation(screen_handler, **self.config)
+    def build_enemy_waves(self, screen_handler: ScreenHandler):
+        waves_config = self.config.waves
+        scheduler = WaveScheduler(iter_waves(waves_config), waves_config.delay)
+        screen_handler.wave_scheduler = scheduler
+        scheduler.start_next_wave(screen_handler)
 
     def build_player(self, screen_handler: ScreenHandler):
-        height = screen_handler.screen.get_height()
-        bottom_buffer = self.config['window']['bottom_buffer']
-
-        player_radius = self.config['player']['radius']
+        player_radius = self.config.player.radius
         player_x = screen_handler.screen.get_width() // 2
-        player_y = height - bottom_buffer - player_radius
-        player_vel = self.config['player']['vel']
+        player_y = self.config.play_field.bottom - player_radius
+        player_vel = self.config.player_vel
 
-        screen_handler.screen_object_factory.create_player(
+        return screen_handler.screen_object_factory.create_player(
             player_x,
             player_y,
             player_vel,
             player_radius
         )
 
-    def play(self):
+    def play(self, record_path=None, capture_dir=None):
+        """Play interactively. With `record_path`, save the input log there on exit.
+
+        Frames are saved while playing if capture is enabled in the config
+        or `capture_dir` is given.
+        """
         window = self.create_screen()
+        self.start_music()
 
-        self.game_meta = GameMeta(**self.config['meta'])
-        screen_handler = ScreenHandler(window, self.game_meta)
+        profiler = create_profiler(self.config.profiler.enabled)
+        clock = self.create_clock()
+        recorder = InputRecorder(KeyboardInput(), clock.seed)
+        self.game_meta = self.create_game_meta()
+        screen_handler = ScreenHandler(
+            window, self.game_meta, input_source=recorder, clock=clock, profiler=profiler)
+        self.use_display(screen_handler)
 
         self.show_home_screen(screen_handler)
         self.prepare_game_screen(screen_handler)
+        if profiler.enabled and self.config.profiler.overlay:
+            screen_handler.screen_object_factory.create_profiler_overlay(profiler, 5, 5)
+
+        # precise: frames at window.fps, each running the ticks real time owes
+        precise = self.config.window.pacing == 'precise'
+        pacer = FramePacer(1000 / self.config.window.fps, self.config.window.spin_ms)
+        steps = FixedStep(clock.step_ms)
+        latency = LatencyTracker()
+        capture = None
+        if capture_dir or self.config.capture.enabled:
+            capture = create_frame_capture(self.config, capture_dir)
 
         running = True
         while running:
-            pygame.time.delay(50)
+            profiler.begin_frame()
+            if not precise:
+                with profiler.phase('delay'):
+                    pygame.time.delay(50)
 
+            # pumping events refreshes the key state the tick samples
+            latency.input_sampled()
             if any(event.type == pygame.QUIT for event in pygame.event.get()):
                 running = False
             if pygame.key.get_pressed()[pygame.K_q]:
                 running = False
+            if not running:
+                recorder.record_quit()
 
-            if self.player_has_lost(screen_handler):
-                self.game_meta.set_game_lost()
-                pygame.mixer.music.fadeout(5000)
-                self.draw_end_screen(screen_handler, 'YOU LOST!')
-            elif self.player_has_won(screen_handler):
-                self.game_meta.set_game_won()
+            ticks = steps.steps_due() if precise else 1
+            if not running:
+                ticks = max(ticks, 1)  # so the quit makes it into the recording
+            end_message = self.check_game_over(screen_handler)
+            if end_message:
                 pygame.mixer.music.fadeout(5000)
-                self.draw_end_screen(screen_handler, 'YOU WON!')
+                self.draw_end_screen(screen_handler, end_message)
             else:
-                screen_handler.update_screen_state()
+                for _ in range(ticks):
+                    screen_handler.update_screen_state()
+                    latency.input_consumed()
+                    if self.check_game_over(screen_handler):
+                        break
+
+            if end_message or ticks:
+                with profiler.phase('present'):
+                    screen_handler.renderer.present()
+                latency.presented()
+                if capture is not None:
+                    with profiler.phase('capture'):
+                        capture.capture(screen_handler.screen)
+
+            with profiler.phase('tick'):
+                if precise:
+                    pacer.wait()
+                else:
+                    self.clock.tick(self.config.window.fps)
+            profiler.end_frame(screen_handler.entity_counts() if profiler.enabled else None)
+
+        self.metrics['input_latency_ms'] = latency.percentiles()
+        if precise:
+            self.metrics['late_frames'] = pacer.late_frames
+        try:
+            if capture is not None:
+                capture.finish()  # while pygame is still up for the encoders
+                self.metrics['dropped_frames'] = capture.dropped
+            if profiler.enabled:
+                profiler.export_trace(self.config.profiler.trace_file)
+            if record_path:
+                recorder.log.save(record_path)
+        finally:
+            screen_handler.sounds.close()
+            pygame.quit()
+        if capture is not None:
+            capture.close()  # encoding errors surface only once everything else is saved
+
+    def simulate(self, input_source, max_ticks=None, seed=None):
+        """Play a game with no window, audio or frame cap.
+
+        Steps the game as fast as possible using `input_source` for the
+        player controls until the game ends, the input is exhausted or
+        `max_ticks` is reached. Returns the final GameMeta.
+        """
+        screen = pygame.Surface(self.config.window.size)
+        screen_handler = self.start_simulation(screen, input_source, seed)
+        self.run_simulation(screen_handler, max_ticks)
+        return self.game_meta
+
+    def replay(self, log: InputLog, seek_tick=0, watch=False, capture_dir=None):
+        """Play back a recorded game and return the final GameMeta.
+
+        The first `seek_tick` ticks are fast-forwarded without rendering.
+        After that the game either keeps running at simulation speed or,
+        with `watch`, is drawn in a window at normal game speed.
+
+        With `capture_dir` every frame from `seek_tick` on is saved there,
+        window or not. Without a window nobody is waiting on the frames,
+        so the replay slows down to the encoders instead of dropping any.
+        """
+        if watch:
+            screen = self.create_screen()
+        else:
+            screen = pygame.Surface(self.config.window.size)
+        screen_handler = self.start_simulation(screen, RecordedInput(log), log.seed)
+        self.run_simulation(screen_handler, seek_tick)
+        if not watch:
+            if capture_dir is None:
+                self.run_simulation(screen_handler)
+                return self.game_meta
+            capture = create_frame_capture(self.config, capture_dir, block=True)
+            screen_handler.render = True
+            screen_handler.renderer.invalidate()
+            try:
+                while self.run_simulation(screen_handler, max_ticks=1):
+                    capture.capture(screen)
+            finally:
+                capture.finish()
+            capture.close()
+            return self.game_meta
+
+        capture = create_frame_capture(self.config, capture_dir) if capture_dir else None
+        screen_handler.render = True
+        self.use_display(screen_handler)
+        screen_handler.renderer.invalidate()
+        ticks_per_second = 1000 / screen_handler.clock.step_ms
+        while self.game_meta.game_being_played and not screen_handler.input_source.exhausted:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            self.run_simulation(screen_handler, max_ticks=1)
+            screen_handler.renderer.present()
+            if capture is not None:
+                capture.capture(screen)
+            self.clock.tick(ticks_per_second)
+        try:
+            if capture is not None:
+                capture.finish()
+                self.metrics['dropped_frames'] = capture.dropped
+        finally:
+            pygame.quit()
+        if capture is not None:
+            capture.close()
+        return self.game_meta
+
+    def start_simulation(self, screen, input_source, seed=None):
+        """Build a game driven by `input_source`, without rendering or sound."""
+        self.game_meta = self.create_game_meta()
+        screen_handler = ScreenHandler(
+            screen, self.game_meta, input_source=input_source,
+            clock=self.create_clock(seed), render=False, sound=False)
+        self.prepare_game_screen(screen_handler)
+        return screen_handler
+
+    def run_simulation(self, screen_handler, max_ticks=None):
+        """Step the game until it ends, its input runs out or `max_ticks` pass.
+
+        Returns the number of ticks run.
+        """
+        input_source = screen_handler.input_source
+        ticks = 0
+        while self.game_meta.game_being_played:
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            if self.check_game_over(screen_handler):
+                break
+            if input_source.exhausted:
+                break
+            screen_handler.update_screen_state()
+            ticks += 1
+        return ticks
 
-            pygame.display.update()
+    def create_game_meta(self):
+        return GameMeta(self.config.meta.start_lives, self.config.meta.start_points)
 
-            self.clock.tick(self.config['window']['fps'])
+    def create_clock(self, seed=None):
+        if seed is None:
+            seed = self.config.clock.seed
+        return SimulationClock(self.config.clock.step_ms, seed)
 
-        pygame.quit()
+    def check_game_over(self, screen_handler):
+        if self.player_has_lost(screen_handler):
+            self.game_meta.set_game_lost()
+            return 'YOU LOST!'
+        if self.player_has_won(screen_handler):
+            self.game_meta.set_game_won()
+            return 'YOU WON!'
+        return None
 
     def player_has_lost(self, screen_handler):
         if self.game_meta.game_being_played:
@@ -109,12 +322,15 @@ class Game:
 
     def player_has_won(self, screen_handler):
         if self.game_meta.game_being_played:
-            enemies_defeated = not screen_handler.enemies
+            scheduler = screen_handler.wave_scheduler
+            enemies_defeated = not screen_handler.enemies and (
+                scheduler is None or scheduler.finished)
             return self.game_meta.player_has_lives and enemies_defeated
         return self.game_meta.won_state
 
     def draw_end_screen(self, screen_handler, msg: str):
         screen_handler.screen.blit(screen_handler.bg, (0, 0))
+        screen_handler.renderer.invalidate()
         screen_handler.clear_objects_from_screen()
         box = screen_handler.screen_object_factory.create_end_game_box(msg)
         box.draw(self.game_meta.points)
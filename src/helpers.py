@@ -1,4 +1,10 @@
 import math
+import os
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the batch helpers need it
+    np = None
 
 
 def clip_value(value, min, max):
@@ -9,18 +15,42 @@ def clip_value(value, min, max):
     return value
 
 
-def get_lead_enemy(direction, enemies):
-    if direction > 0:
-        max_x = max([e.x for e in enemies])
-        return [e for e in enemies if e.x == max_x][0]
-    elif direction < 0:
-        min_x = min([e.x for e in enemies])
-        return [e for e in enemies if e.x == min_x][0]
-
-
 def detect_collision(obj1, obj2):
     return distance_between_objects(obj1, obj2) <= obj1.radius + obj2.radius
 
 
 def distance_between_objects(obj1, obj2):
     return math.sqrt((obj1.x - obj2.x)**2 + (obj1.y - obj2.y)**2)
+
+
+def squared_distances_batch(xs1, ys1, xs2, ys2):
+    """Squared distance between every point in group 1 and every point in group 2.
+
+    Returns an array of shape (len(xs1), len(xs2)).
+    """
+    if np is None:
+        raise ImportError('squared_distances_batch requires numpy')
+    dx = np.asarray(xs1)[:, None] - np.asarray(xs2)[None, :]
+    dy = np.asarray(ys1)[:, None] - np.asarray(ys2)[None, :]
+    return dx*dx + dy*dy
+
+
+def detect_collisions_batch(xs1, ys1, radii1, xs2, ys2, radii2):
+    """Batch version of detect_collision for two groups of circles.
+
+    Returns a pair of index arrays (i, j) such that object i of group 1
+    collides with object j of group 2. Squared distances are compared so
+    no square root is taken; for integer coordinates this gives exactly
+    the same answer as detect_collision.
+    """
+    if np is None:
+        raise ImportError('detect_collisions_batch requires numpy')
+    dist_sq = squared_distances_batch(xs1, ys1, xs2, ys2)
+    reach = np.asarray(radii1)[:, None] + np.asarray(radii2)[None, :]
+    return np.nonzero(dist_sq <= reach*reach)
+
+
+def use_dummy_drivers():
+    # SDL reads these on init, so set them before pygame is initialised
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
@@ -0,0 +1,159 @@
+from collections import namedtuple
+import struct
+
+import pygame
+
+
+# Snapshot of the keys the player reacts to, sampled once per tick
+InputState = namedtuple('InputState', ['left', 'right', 'shoot'])
+NO_INPUT = InputState(False, False, False)
+
+# Bits of the per-tick input mask stored in recordings
+LEFT = 1
+RIGHT = 2
+SHOOT = 4
+QUIT = 8
+
+
+def input_to_mask(state: InputState) -> int:
+    return (LEFT if state.left else 0) | (RIGHT if state.right else 0) | (SHOOT if state.shoot else 0)
+
+
+def mask_to_input(mask: int) -> InputState:
+    return InputState(bool(mask & LEFT), bool(mask & RIGHT), bool(mask & SHOOT))
+
+
+class KeyboardInput:
+    """Reads the live keyboard state. Needs a display to receive key events."""
+
+    exhausted = False
+
+    def read(self):
+        keys = pygame.key.get_pressed()
+        return InputState(
+            bool(keys[pygame.K_LEFT]),
+            bool(keys[pygame.K_RIGHT]),
+            bool(keys[pygame.K_SPACE]),
+        )
+
+
+class ScriptedInput:
+    """Feeds a fixed sequence of InputState values, one per tick.
+
+    Once the sequence runs out every read returns NO_INPUT and
+    `exhausted` is set so a simulation loop knows to stop.
+    """
+
+    def __init__(self, states):
+        self.states = iter(states)
+        self.exhausted = False
+
+    def read(self):
+        try:
+            return next(self.states)
+        except StopIteration:
+            self.exhausted = True
+            return NO_INPUT
+
+
+class InputLog:
+    """Per-tick input masks of one game plus the RNG seed it was played with.
+
+    Stored as run-length encoded (mask, count) pairs; held keys and idle
+    stretches collapse into a single run. The binary format is a header
+    (magic, version, seed, tick count) followed by 3-byte runs.
+    """
+
+    MAGIC = b'SIIL'
+    VERSION = 3  # 2: enemy shot timing moved to the timer queue, 3: later waves wait to move
+    HEADER = struct.Struct('<4sBQQ')
+    RUN = struct.Struct('<BH')
+    MAX_RUN = 0xFFFF
+
+    def __init__(self, seed: int, runs=None):
+        self.seed = seed
+        self.runs = runs or []  # list of [mask, count]
+        self.tick_count = sum(count for _, count in self.runs)
+
+    def append(self, mask: int):
+        if self.runs and self.runs[-1][0] == mask and self.runs[-1][1] < self.MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.tick_count += 1
+
+    def masks(self, start_tick=0):
+        """Yield the mask of every tick from `start_tick` on."""
+        tick = 0
+        for mask, count in self.runs:
+            if tick + count > start_tick:
+                for _ in range(count - max(0, start_tick - tick)):
+                    yield mask
+            tick += count
+
+    def to_bytes(self) -> bytes:
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.tick_count)
+        return header + b''.join(self.RUN.pack(mask, count) for mask, count in self.runs)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        magic, version, seed, tick_count = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Not an input recording (or from an unsupported version)")
+        runs = [list(run) for run in cls.RUN.iter_unpack(data[cls.HEADER.size:])]
+        log = cls(seed, runs)
+        if log.tick_count != tick_count:
+            raise ValueError("Input recording is truncated")
+        return log
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class InputRecorder:
+    """Wraps another input source and logs every state it reads."""
+
+    def __init__(self, source, seed: int):
+        self.source = source
+        self.log = InputLog(seed)
+        self.quit_pending = False
+
+    @property
+    def exhausted(self):
+        return self.source.exhausted
+
+    def record_quit(self):
+        """Mark the next tick as the one the player quit on."""
+        self.quit_pending = True
+
+    def read(self):
+        state = self.source.read()
+        self.log.append(input_to_mask(state) | (QUIT if self.quit_pending else 0))
+        return state
+
+
+class RecordedInput:
+    """Plays an InputLog back, starting from `start_tick`.
+
+    Becomes exhausted after the tick the player quit on, or when the log
+    runs out.
+    """
+
+    def __init__(self, log: InputLog, start_tick=0):
+        self.masks = log.masks(start_tick)
+        self.exhausted = False
+
+    def read(self):
+        mask = next(self.masks, None)
+        if mask is None:
+            self.exhausted = True
+            return NO_INPUT
+        if mask & QUIT:
+            self.exhausted = True
+        return mask_to_input(mask)
@@ -0,0 +1,366 @@
+"""Authoritative game server and client over localhost UDP.
+
+The server steps one headless game and gives every client its own
+Player. Clients send their input mask each tick along with the newest
+snapshot tick they have applied. The server answers each tick with a
+snapshot relative to that acknowledged tick. The snapshot carries only
+entities that were added or changed since then, plus the ids of removed
+ones.
+
+Enemies are sent as a formation id plus their fixed grid position, and
+each formation as its offset. When a formation moves, only that one
+record changes, so the per-tick snapshot size follows the number of
+bullets and players, not the number of enemies.
+
+Messages (little endian):
+
+    HELLO    type
+    WELCOME  type, player id, tick
+    INPUT    type, acked tick, input mask
+    BYE      type
+    SNAPSHOT type, tick, base tick (0 = full), points, lives, flags,
+             part, part count, update count, removed count,
+             then (id, kind, ref, x, y) per update and an id per removal
+
+A snapshot too big for one datagram is split into parts, each with its
+share of the updates and removals. The client applies it once every
+part has arrived.
+"""
+import itertools
+import socket
+import struct
+import time
+
+import pygame
+
+from src.game import Game
+from src.inputs import NO_INPUT, QUIT, ScriptedInput, input_to_mask, mask_to_input
+from src.screen_objects import ShootingEnemy
+
+HELLO = 1
+WELCOME = 2
+INPUT = 3
+SNAPSHOT = 4
+BYE = 5
+
+MESSAGE_TYPE = struct.Struct('<B')
+WELCOME_MSG = struct.Struct('<BII')
+INPUT_MSG = struct.Struct('<BIB')
+SNAPSHOT_HEADER = struct.Struct('<BIIihBBBHH')
+ENTITY = struct.Struct('<IBIhh')
+ENTITY_ID = struct.Struct('<I')
+
+# Entity kinds
+PLAYER = 1
+PLAYER_BULLET = 2
+ENEMY_BULLET = 3
+ENEMY = 4
+SHOOTING_ENEMY = 5
+FORMATION = 6
+
+# Snapshot flags
+GAME_OVER = 1
+WON = 2
+
+HISTORY = 64  # ticks of snapshots kept to diff against
+MAX_DATAGRAM = 65507
+
+
+def capture_state(screen_handler):
+    """id -> (kind, ref, x, y) for every entity a client needs to draw."""
+    state = {}
+    for formation in screen_handler.formations:
+        state[formation.id] = (FORMATION, 0, formation.offset_x, formation.offset_y)
+    for kind, objects in ((PLAYER, screen_handler.players),
+                          (PLAYER_BULLET, screen_handler.player_bullets),
+                          (ENEMY_BULLET, screen_handler.enemy_bullets)):
+        for obj in objects:
+            state[obj.id] = (kind, 0, round(obj.x), round(obj.y))
+    for enemy in screen_handler.enemies:
+        kind = SHOOTING_ENEMY if isinstance(enemy, ShootingEnemy) else ENEMY
+        if enemy.formation is None:
+            state[enemy.id] = (kind, 0, enemy.x, enemy.y)
+        else:
+            state[enemy.id] = (kind, enemy.formation.id, enemy.grid_x, enemy.grid_y)
+    return state
+
+
+def diff_states(base, current):
+    """(updates, removed ids) that turn `base` into `current`."""
+    updates = [(id, entity) for id, entity in current.items() if base.get(id) != entity]
+    removed = [id for id in base if id not in current]
+    return updates, removed
+
+
+def encode_snapshot(tick, base_tick, game_meta, updates, removed, max_size=MAX_DATAGRAM):
+    """The snapshot as a list of datagrams, each at most `max_size` bytes."""
+    flags = (0 if game_meta.game_being_played else GAME_OVER) | (WON if game_meta.won_state else 0)
+    room = max_size - SNAPSHOT_HEADER.size
+    chunks = []  # (updates, removed) per part
+    part_updates, part_removed, used = [], [], 0
+    for record, size, is_update in itertools.chain(
+            ((ENTITY.pack(id, *entity), ENTITY.size, True) for id, entity in updates),
+            ((ENTITY_ID.pack(id), ENTITY_ID.size, False) for id in removed)):
+        if used + size > room:
+            chunks.append((part_updates, part_removed))
+            part_updates, part_removed, used = [], [], 0
+        (part_updates if is_update else part_removed).append(record)
+        used += size
+    chunks.append((part_updates, part_removed))
+
+    return [
+        b''.join([SNAPSHOT_HEADER.pack(SNAPSHOT, tick, base_tick, game_meta.points, game_meta.lives,
+                                       flags, part, len(chunks), len(part_updates),
+                                       len(part_removed)),
+                  *part_updates, *part_removed])
+        for part, (part_updates, part_removed) in enumerate(chunks)
+    ]
+
+
+def decode_snapshot(data):
+    """tick, base tick, (points, lives, flags), (part, parts), updates, removed ids"""
+    _, tick, base_tick, points, lives, flags, part, parts, n_updates, n_removed = \
+        SNAPSHOT_HEADER.unpack_from(data)
+    offset = SNAPSHOT_HEADER.size
+    updates = []
+    for _ in range(n_updates):
+        id, *entity = ENTITY.unpack_from(data, offset)
+        updates.append((id, tuple(entity)))
+        offset += ENTITY.size
+    removed = [id for (id,) in ENTITY_ID.iter_unpack(data[offset:offset + n_removed * ENTITY_ID.size])]
+    return tick, base_tick, (points, lives, flags), (part, parts), updates, removed
+
+
+class RemoteClient:
+    """What the server knows about one connected client."""
+
+    def __init__(self, player):
+        self.player = player
+        self.mask = 0
+        self.acked_tick = 0
+
+
+class GameServer:
+    """Steps one game and streams delta snapshots to its clients.
+
+    Call `step` once per tick (or `serve_forever` to run in real time).
+    Everything is non-blocking, so a test can drive a server and its
+    clients from one thread.
+    """
+
+    def __init__(self, address=('127.0.0.1', 0), seed=None, max_clients=4):
+        self.game = Game(headless=True)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(address)
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.max_clients = max_clients
+
+        screen = pygame.Surface(self.game.config.window.size)
+        self.screen_handler = self.game.start_simulation(
+            screen, ScriptedInput(itertools.repeat(NO_INPUT)), seed)
+        self.spare_players = list(self.screen_handler.players)
+        self.clients = {}  # address -> RemoteClient
+        self.tick = 0
+        self.history = {}  # tick -> captured state
+        self.bytes_sent = 0
+
+    def receive(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(MAX_DATAGRAM)
+            except BlockingIOError:
+                return
+            if data:
+                self.handle_message(data, address)
+
+    def handle_message(self, data, address):
+        (message_type,) = MESSAGE_TYPE.unpack_from(data)
+        client = self.clients.get(address)
+        if message_type == HELLO:
+            if client is None:
+                if len(self.clients) >= self.max_clients:
+                    return
+                client = self.clients[address] = RemoteClient(self.add_player())
+            self.send(WELCOME_MSG.pack(WELCOME, client.player.id, self.tick), address)
+        elif client is None:
+            return
+        elif message_type == INPUT:
+            _, acked_tick, mask = INPUT_MSG.unpack_from(data)
+            client.acked_tick = max(client.acked_tick, acked_tick)
+            client.mask = mask
+            if mask & QUIT:
+                self.remove_client(address)
+        elif message_type == BYE:
+            self.remove_client(address)
+
+    def add_player(self):
+        if self.spare_players:
+            return self.spare_players.pop()
+        return self.game.build_player(self.screen_handler)
+
+    def remove_client(self, address):
+        client = self.clients.pop(address)
+        self.screen_handler.player_inputs.pop(client.player.id, None)
+        self.screen_handler.remove_screen_object(client.player)
+
+    def step(self):
+        """Read client messages, advance the game one tick and send snapshots."""
+        self.receive()
+        sh = self.screen_handler
+        if self.game.game_meta.game_being_played and not self.game.check_game_over(sh):
+            sh.player_inputs = {
+                client.player.id: mask_to_input(client.mask) for client in self.clients.values()
+            }
+            sh.update_screen_state()
+        self.tick += 1
+        self.history[self.tick] = capture_state(sh)
+        self.history.pop(self.tick - HISTORY, None)
+        self.send_snapshots()
+
+    def send_snapshots(self):
+        current = self.history[self.tick]
+        encoded = {}  # clients acked on the same tick get the same bytes
+        for address, client in self.clients.items():
+            base_tick = client.acked_tick if client.acked_tick in self.history else 0
+            data = encoded.get(base_tick)
+            if data is None:
+                updates, removed = diff_states(self.history.get(base_tick, {}), current)
+                data = encoded[base_tick] = encode_snapshot(
+                    self.tick, base_tick, self.game.game_meta, updates, removed)
+            for part in data:
+                self.send(part, address)
+
+    def send(self, data, address):
+        self.sock.sendto(data, address)
+        self.bytes_sent += len(data)
+
+    def serve_forever(self, should_stop=lambda: False):
+        """Step at the game's tick rate until `should_stop()` is true."""
+        step_s = self.screen_handler.clock.step_ms / 1000
+        next_step = time.perf_counter()
+        while not should_stop():
+            self.step()
+            next_step += step_s
+            time.sleep(max(0.0, next_step - time.perf_counter()))
+
+    def close(self):
+        self.sock.close()
+
+
+class GameClient:
+    """Joins a GameServer, sends input and rebuilds the world from snapshots."""
+
+    def __init__(self, server_address):
+        self.server_address = server_address
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect(server_address)
+        self.sock.setblocking(False)
+        self.player_id = None
+        self.snapshots = {0: {}}  # tick -> entity states, the newest HISTORY kept
+        self.partial = {}  # tick -> {part: (updates, removed)} of split snapshots
+        self.tick = 0
+        self.points = 0
+        self.lives = 0
+        self.flags = 0
+        self.bytes_received = 0
+
+    def hello(self):
+        """Ask to join. The WELCOME is picked up by `poll` (or `join`)."""
+        self.sock.send(MESSAGE_TYPE.pack(HELLO))
+
+    def join(self, timeout=1.0, attempts=5):
+        """Say hello until the server welcomes us. Returns our player id.
+
+        Blocks, so the server has to be stepping in another thread or
+        process; in one thread use `hello` and `poll` instead.
+        """
+        self.sock.settimeout(timeout)
+        try:
+            for _ in range(attempts):
+                self.hello()
+                try:
+                    self.handle_message(self.sock.recv(MAX_DATAGRAM))
+                except socket.timeout:
+                    continue
+                if self.player_id is not None:
+                    return self.player_id
+            raise ConnectionError(f"No answer from game server at {self.server_address}")
+        finally:
+            self.sock.setblocking(False)
+
+    def send_input(self, state, quit=False):
+        mask = input_to_mask(state) | (QUIT if quit else 0)
+        self.sock.send(INPUT_MSG.pack(INPUT, self.tick, mask))
+
+    def leave(self):
+        self.sock.send(MESSAGE_TYPE.pack(BYE))
+        self.sock.close()
+
+    def poll(self):
+        """Handle every message waiting on the socket. Returns snapshots applied."""
+        applied = 0
+        while True:
+            try:
+                data = self.sock.recv(MAX_DATAGRAM)
+            except (BlockingIOError, ConnectionRefusedError):
+                return applied
+            applied += self.handle_message(data)
+
+    def handle_message(self, data):
+        (message_type,) = MESSAGE_TYPE.unpack_from(data)
+        if message_type == WELCOME:
+            _, self.player_id, _ = WELCOME_MSG.unpack(data)
+        elif message_type == SNAPSHOT:
+            return self.handle_snapshot(data)
+        return False
+
+    def handle_snapshot(self, data):
+        self.bytes_received += len(data)
+        tick, base_tick, (points, lives, flags), (part, parts), updates, removed = \
+            decode_snapshot(data)
+        base = self.snapshots.get(base_tick)
+        if tick <= self.tick or base is None:
+            return False  # stale, or built on a snapshot we no longer have
+        if parts > 1:
+            received = self.partial.setdefault(tick, {})
+            received[part] = (updates, removed)
+            if len(received) < parts:
+                return False
+            updates = [update for part_updates, _ in received.values() for update in part_updates]
+            removed = [id for _, part_removed in received.values() for id in part_removed]
+            # parts of older ticks can never be applied now
+            self.partial = {t: p for t, p in self.partial.items() if t > tick}
+
+        state = dict(base)
+        state.update(updates)
+        for id in removed:
+            del state[id]
+        self.snapshots[tick] = state
+        for old_tick in [t for t in self.snapshots if 0 < t <= tick - HISTORY]:
+            del self.snapshots[old_tick]
+        self.tick, self.points, self.lives, self.flags = tick, points, lives, flags
+        return True
+
+    @property
+    def entities(self):
+        return self.snapshots[self.tick]
+
+    @property
+    def game_over(self):
+        return bool(self.flags & GAME_OVER)
+
+    @property
+    def won(self):
+        return bool(self.flags & WON)
+
+    def positions(self):
+        """Yield (id, kind, x, y) in window coordinates for everything but formations."""
+        entities = self.entities
+        for id, (kind, ref, x, y) in entities.items():
+            if kind == FORMATION:
+                continue
+            if ref:
+                _, _, offset_x, offset_y = entities[ref]
+                x, y = x + offset_x, y + offset_y
+            yield id, kind, x, y
@@ -0,0 +1,121 @@
+from collections import deque
+import time
+
+
+class FramePacer:
+    """Holds the frame loop to a fixed period.
+
+    Frames are timed against absolute deadlines rather than the length of
+    the previous frame, so slow frames are caught up instead of making the
+    game drift behind real time. `wait` sleeps until shortly before the
+    deadline and, with `spin_ms`, busy-waits the rest, since a plain
+    sleep can overshoot by a millisecond or more. A loop that falls more
+    than a whole period behind starts counting again from now rather than
+    running a burst of frames back to back.
+
+    `clock` and `sleep` are only swapped out by tests.
+    """
+
+    def __init__(self, period_ms: float, spin_ms: float = 1.0,
+                 clock=time.perf_counter, sleep=time.sleep):
+        self.period = period_ms / 1000
+        self.spin = spin_ms / 1000
+        self.clock = clock
+        self.sleep = sleep
+        self.deadline = None
+        self.late_frames = 0
+
+    def wait(self):
+        """Block until the end of the current frame period."""
+        now = self.clock()
+        if self.deadline is None:
+            self.deadline = now
+        self.deadline += self.period
+        if now > self.deadline:
+            self.late_frames += 1
+            if now - self.deadline > self.period:
+                self.deadline = now
+            return
+
+        remaining = self.deadline - now - self.spin
+        if remaining > 0:
+            self.sleep(remaining)
+        while self.clock() < self.deadline:
+            pass
+
+
+class FixedStep:
+    """Turns real time into a whole number of fixed simulation steps.
+
+    Lets frames run at the display rate while every game tick still
+    covers exactly `step_ms` of game time. After a long stall at most
+    `max_steps` are owed at once and the rest is dropped, so the game
+    slows down instead of freezing to catch up.
+    """
+
+    def __init__(self, step_ms: float, max_steps=5, clock=time.perf_counter):
+        self.step = step_ms / 1000
+        self.max_steps = max_steps
+        self.clock = clock
+        self.last = None
+        self.owed = 0.0
+
+    def steps_due(self) -> int:
+        now = self.clock()
+        if self.last is None:
+            self.last = now
+            self.owed = self.step  # the first frame runs one tick
+        self.owed += now - self.last
+        self.last = now
+        # allow for rounding, e.g. three 1/60 s frames per 50 ms step
+        steps = min(int(self.owed / self.step + 1e-9), self.max_steps)
+        self.owed = 0.0 if steps == self.max_steps else self.owed - steps * self.step
+        return steps
+
+
+class LatencyTracker:
+    """How long input takes to reach the screen, over recent ticks.
+
+    Two numbers are kept for every frame that ran a tick. `latency` is
+    the time from the input sample the tick read to the present that
+    showed its result. `interval` is the time since the previous tick's
+    sample, i.e. how long a key press can wait before any tick reads it.
+    A press's worst case is the sum of the two.
+    """
+
+    def __init__(self, max_samples=10_000, clock=time.perf_counter):
+        self.clock = clock
+        self.latency = deque(maxlen=max_samples)
+        self.interval = deque(maxlen=max_samples)
+        self.sample_time = None
+        self.consumed_time = None
+        self.pending = False
+
+    def input_sampled(self):
+        self.sample_time = self.clock()
+
+    def input_consumed(self):
+        """Note that a tick read the latest sample."""
+        if not self.pending:
+            if self.consumed_time is not None:
+                self.interval.append(1000 * (self.sample_time - self.consumed_time))
+            self.consumed_time = self.sample_time
+            self.pending = True
+
+    def presented(self):
+        if self.pending:
+            self.latency.append(1000 * (self.clock() - self.consumed_time))
+            self.pending = False
+
+    def percentiles(self, percents=(50, 95, 99)):
+        """{'latency': {'p50': ms, ...}, 'interval': {...}} by nearest rank."""
+        return {name: _percentiles(samples, percents)
+                for name, samples in (('latency', self.latency), ('interval', self.interval))}
+
+
+def _percentiles(samples, percents):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {f'p{p}': ordered[round(last * p / 100)] for p in percents}
@@ -0,0 +1,108 @@
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+import json
+import time
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off. Every hook is a no-op."""
+
+    enabled = False
+    _phase = nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def time_each(self, objects, action, *args):
+        for obj in objects:
+            getattr(obj, action)(*args)
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self, counts=None):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class FrameProfiler:
+    """Times named phases of each frame.
+
+    `last_frame` holds the per-phase milliseconds of the previous frame,
+    for the on-screen overlay. Every phase is also kept as a Chrome trace
+    event (the most recent `max_events` of them) so a run can be loaded
+    into chrome://tracing or Perfetto with `export_trace`.
+    """
+
+    enabled = True
+
+    def __init__(self, max_events=200_000):
+        self.events = deque(maxlen=max_events)
+        self.origin = time.perf_counter()
+        self.frame_start = None
+        self.current = defaultdict(float)
+        self.last_frame = {}
+        self.frame_ms = 0.0
+        self.counts = {}
+
+    def _us(self, t):
+        return 1e6 * (t - self.origin)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.current[name] += 1000 * (end - start)
+            self.events.append({
+                'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                'ts': self._us(start), 'dur': 1e6 * (end - start),
+            })
+
+    def time_each(self, objects, action, *args):
+        """Call `action` on each object, timing the total per object type."""
+        totals = defaultdict(float)
+        start = time.perf_counter()
+        for obj in objects:
+            t = time.perf_counter()
+            getattr(obj, action)(*args)
+            totals[type(obj).__name__] += time.perf_counter() - t
+        for name, seconds in totals.items():
+            self.current[f'{action}:{name}'] += 1000 * seconds
+        self.events.append({
+            'name': action, 'ph': 'C', 'pid': 0, 'tid': 0, 'ts': self._us(start),
+            'args': {name: 1000 * seconds for name, seconds in totals.items()},
+        })
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        self.current = defaultdict(float)
+
+    def end_frame(self, counts=None):
+        end = time.perf_counter()
+        if self.frame_start is None:
+            return
+        self.frame_ms = 1000 * (end - self.frame_start)
+        self.last_frame = dict(self.current)
+        self.events.append({
+            'name': 'frame', 'ph': 'X', 'pid': 0, 'tid': 0,
+            'ts': self._us(self.frame_start), 'dur': 1e6 * (end - self.frame_start),
+        })
+        if counts:
+            self.counts = counts
+            self.events.append({
+                'name': 'entities', 'ph': 'C', 'pid': 0, 'tid': 0,
+                'ts': self._us(end), 'args': counts,
+            })
+
+    def export_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}, f)
+
+
+def create_profiler(enabled=False):
+    return FrameProfiler() if enabled else NULL_PROFILER
@@ -0,0 +1,173 @@
+import pygame
+
+from src.profiler import NULL_PROFILER
+
+
+class FullRenderer:
+    """Redraws the whole frame and pushes the whole window to the display."""
+
+    def __init__(self, screen: pygame.Surface, bg: pygame.Surface, profiler=NULL_PROFILER):
+        self.screen = screen
+        self.bg = bg
+        self.profiler = profiler
+
+    def draw(self, screen_objects):
+        with self.profiler.phase('background'):
+            self.screen.blit(self.bg, (0, 0))
+        draw_objects(screen_objects, self.profiler)
+
+    def invalidate(self):
+        pass
+
+    def present(self):
+        pygame.display.update()
+
+
+class DirtyRectRenderer:
+    """Only redraws and pushes the parts of the frame that changed.
+
+    Each object's bounding rect (`get_rect`) is remembered between
+    frames. The old and new rects of objects that moved or disappeared
+    are restored from the background and every object overlapping them is
+    redrawn. Objects with `always_redraw` set are treated as changed
+    every frame. Only the changed rects are passed to display.update,
+    unless there are more than `max_dirty_rects` of them, when a full
+    redraw is cheaper.
+    """
+
+    max_dirty_rects = 200
+
+    def __init__(self, screen: pygame.Surface, bg: pygame.Surface, profiler=NULL_PROFILER):
+        self.screen = screen
+        self.bg = bg
+        self.profiler = profiler
+        self.previous_rects = {}
+        self.dirty_rects = None  # None means the whole screen
+        self.full_redraw = True
+
+    def draw(self, screen_objects):
+        objects = list(screen_objects)
+        rects = {object.id: object.get_rect() for object in objects}
+
+        if self.full_redraw:
+            with self.profiler.phase('background'):
+                self.screen.blit(self.bg, (0, 0))
+            draw_objects(objects, self.profiler)
+            self.previous_rects = rects
+            self.dirty_rects = None
+            self.full_redraw = False
+            return
+
+        changed = {
+            object.id for object in objects
+            if object.always_redraw or self.previous_rects.get(object.id) != rects[object.id]
+        }
+        cleared = [
+            rect for id, rect in self.previous_rects.items()
+            if id in changed or id not in rects
+        ]
+        dirty = cleared + [rects[id] for id in changed]
+
+        # anything overlapping a dirty area is redrawn from a clean
+        # background too, which can in turn dirty more objects. Each pass
+        # only checks the rects the previous pass added.
+        redraw = set(changed)
+        clean = [(object.id, rects[object.id]) for object in objects if object.id not in redraw]
+        added = dirty
+        while added and clean and len(dirty) <= self.max_dirty_rects:
+            clean_rects = [rect for _, rect in clean]
+            hit = set()
+            for rect in added:
+                hit.update(rect.collidelistall(clean_rects))
+            added = [clean[i][1] for i in sorted(hit)]
+            redraw.update(clean[i][0] for i in hit)
+            dirty.extend(added)
+            clean = [entry for i, entry in enumerate(clean) if i not in hit]
+
+        if len(dirty) > self.max_dirty_rects:
+            self.full_redraw = True
+            self.draw(objects)
+            return
+
+        with self.profiler.phase('background'):
+            for rect in dirty:
+                self.screen.blit(self.bg, rect, rect)
+        draw_objects([object for object in objects if object.id in redraw], self.profiler)
+
+        self.previous_rects = rects
+        self.dirty_rects = dirty
+
+    def invalidate(self):
+        """Force a full redraw, e.g. after something drew over the whole screen."""
+        self.previous_rects = {}
+        self.dirty_rects = None
+        self.full_redraw = True
+
+    def present(self):
+        if self.dirty_rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.dirty_rects)
+
+
+class ScaledRenderer:
+    """Wraps another renderer drawing at the game size and scales each frame to the display.
+
+    The game is drawn on its own fixed-size surface, so drawing costs
+    the same whatever the display size; only the final scale grows with
+    it. `smooth` picks bilinear filtering over whole-pixel scaling. The
+    image keeps its aspect ratio and is centred, with black borders.
+    """
+
+    def __init__(self, renderer, display: pygame.Surface, smooth=False, profiler=NULL_PROFILER):
+        self.renderer = renderer
+        self.source = renderer.screen
+        self.display = display
+        self.smooth = smooth
+        self.profiler = profiler
+
+        width, height = self.source.get_size()
+        display_width, display_height = display.get_size()
+        scale = min(display_width / width, display_height / height)
+        if not smooth and scale >= 1:
+            scale = int(scale)
+        self.target_rect = pygame.Rect((0, 0), (int(width * scale), int(height * scale)))
+        self.target_rect.center = display.get_rect().center
+        # scale straight into the display rather than via a temporary surface
+        self.target = display.subsurface(self.target_rect)
+        self.borders_drawn = False
+
+    def draw(self, screen_objects):
+        self.renderer.draw(screen_objects)
+
+    def invalidate(self):
+        self.renderer.invalidate()
+        self.borders_drawn = False
+
+    def present(self):
+        if not self.borders_drawn:
+            self.display.fill((0, 0, 0))
+        with self.profiler.phase('scale'):
+            if self.smooth:
+                pygame.transform.smoothscale(self.source, self.target_rect.size, self.target)
+            else:
+                pygame.transform.scale(self.source, self.target_rect.size, self.target)
+        if self.borders_drawn:
+            pygame.display.update(self.target_rect)
+        else:
+            pygame.display.update()
+            self.borders_drawn = True
+
+
+def draw_objects(objects, profiler=NULL_PROFILER):
+    if profiler.enabled:
+        profiler.time_each(objects, 'draw')
+    else:
+        for object in objects:
+            object.draw()
+
+
+def create_renderer(screen: pygame.Surface, bg: pygame.Surface, dirty_rects=False,
+                    profiler=NULL_PROFILER):
+    renderer_cls = DirtyRectRenderer if dirty_rects else FullRenderer
+    return renderer_cls(screen, bg, profiler)
@@ -1,109 +1,252 @@
-import os
+from functools import cached_property
 
 import pygame
 
-from config import get_config
+from config import Config, get_config
+from src.assets import ASSETS
+from src.clock import SimulationClock
 from src.game_meta import GameMeta
 from src.helpers import detect_collision
+from src.entity_store import EntityStore
+from src.inputs import KeyboardInput, NO_INPUT
+from src.profiler import NULL_PROFILER
+from src.render import create_renderer
+from src.sound import create_sound_dispatcher
+from src.spatial import SpatialHash
+from src.timers import TimerQueue
+from src.sprites import get_sprite
 from src.screen_objects import (
     Player,
     PlayerBullet,
     EnemyBullet,
+    Bullet,
     Enemy,
     ScreenObjectFactory,
 )
 
-config = get_config()
-BG = pygame.transform.scale(
-    pygame.image.load(os.path.join('data', 'images', 'background.jpg')),
-    (config['window']['width'], config['window']['height'])
-)
+# Types with their own registry on the ScreenHandler, for fast lookups
+INDEXED_TYPES = (Player, PlayerBullet, EnemyBullet, Enemy)
+
+# concrete type -> the INDEXED_TYPES it belongs to, filled in on first sight
+INDEX_CLASSES = {}
 
-EXPLOSION_SOUND = pygame.mixer.Sound('data/sounds/explosion.wav')
-EXPLOSION_SOUND.set_volume(0.2)
-HURT_SOUND = pygame.mixer.Sound('data/sounds/beep.wav')
-HURT_SOUND.set_volume(4)
+
+def index_classes(object_type):
+    classes = INDEX_CLASSES.get(object_type)
+    if classes is None:
+        classes = INDEX_CLASSES[object_type] = tuple(
+            cls for cls in INDEXED_TYPES if issubclass(object_type, cls))
+    return classes
 
 
 class ScreenHandler:
-    bg = BG
 
-    def __init__(self, screen: pygame.Surface, game_meta: GameMeta):
-        self.screen_objects = []
+    def __init__(self, screen: pygame.Surface, game_meta: GameMeta,
+                 input_source=None, clock: SimulationClock = None, render=True, sound=True,
+                 renderer=None, profiler=NULL_PROFILER, entity_store: EntityStore = None,
+                 config: Config = None):
+        self.config = config = config or get_config()
+        # all objects by id, in creation (and so drawing) order
+        self.screen_objects = {}
+        self.indexes = {cls: {} for cls in INDEXED_TYPES}
+        # objects whose update_state has to run every tick
+        self.updatable = {}
+        self.formations = []
+        self.timers = TimerQueue()
+        self.wave_scheduler = None
+        if entity_store is None and config.entity_store.enabled:
+            entity_store = EntityStore(config.entity_store.capacity)
+        self.entity_store = entity_store
         self.screen_object_factory = ScreenObjectFactory(self)
         self.screen = screen
         self.game_meta = game_meta
+        self.input_source = input_source or KeyboardInput()
+        self.clock = clock or SimulationClock(config.clock.step_ms, config.clock.seed)
+        self.input_state = NO_INPUT
+        self.player_inputs = {}  # player id -> InputState, for players not on input_source
+        self.render = render
+        self.profiler = profiler
+        if renderer is not None:
+            self.renderer = renderer
+        self.collision_grid = SpatialHash(cell_size=2 * config.enemy.radius)
+        self.sounds = create_sound_dispatcher(sound)
 
     def update_screen_state(self):
-        self.cleanup_off_screen_objects()
-        self.handle_player_and_enemy_bullet_collisions()
-        self.handle_enemy_and_player_bullet_collisions()
+        self.clock.tick()
 
-        self.screen.blit(self.bg, (0, 0))
-        for object in self.screen_objects:
-            object.update_state(self)
-            object.draw()
+        # sample input once so every object sees the same state this tick
+        self.input_state = self.input_source.read()
+
+        profiler = self.profiler
+        with profiler.phase('cleanup'):
+            self.cleanup_off_screen_objects()
+        with profiler.phase('player_collisions'):
+            self.handle_player_and_enemy_bullet_collisions()
+        with profiler.phase('enemy_collisions'):
+            self.handle_enemy_and_player_bullet_collisions()
+
+        with profiler.phase('update'):
+            if self.wave_scheduler is not None:
+                self.wave_scheduler.update_state(self)
+            if self.entity_store is not None:
+                self.entity_store.step()
+            # copy as objects and timers may create new ones (e.g. bullets),
+            # which start moving next tick
+            objects = list(self.updatable.values())
+            # formation moves, enemy shots, player reloads
+            self.timers.fire_expired(self.clock.get_ticks())
+            if profiler.enabled:
+                profiler.time_each(objects, 'update_state', self)
+            else:
+                for object in objects:
+                    object.update_state(self)
+
+        # hand this tick's sounds to the player thread
+        self.sounds.flush()
+
+        if self.render:
+            with profiler.phase('draw'):
+                self.draw_screen_objects()
+
+    @cached_property
+    def bg(self):
+        return get_sprite(ASSETS.image('background'), self.screen.get_size(), alpha=False)
+
+    @cached_property
+    def renderer(self):
+        return create_renderer(self.screen, self.bg, dirty_rects=self.config.window.dirty_rects,
+                               profiler=self.profiler)
+
+    def draw_screen_objects(self):
+        self.renderer.draw(self.screen_objects.values())
+
+    def get_input(self, player):
+        return self.player_inputs.get(player.id, self.input_state)
+
+    def play_sound(self, name: str):
+        self.sounds.post(name)
 
     def clear_objects_from_screen(self):
-        self.screen_objects = []
+        for bullet in [*self.player_bullets, *self.enemy_bullets]:
+            self.screen_object_factory.release(bullet)
+        self.screen_objects = {}
+        self.indexes = {cls: {} for cls in INDEXED_TYPES}
+        self.updatable = {}
+        self.formations = []
+        self.timers.clear()
 
     def cleanup_off_screen_objects(self):
+        field = self.config.play_field
+        if self.entity_store is not None:
+            offscreen = self.entity_store.offscreen(field.left, field.right, field.top, field.bottom)
+            for object in offscreen:
+                self.remove_screen_object(object)
+            return
+
         offscreen_objects = [
-            object for object in self.screen_objects
-            if isinstance(object, (PlayerBullet, EnemyBullet)) and object.is_offscreen()
+            object
+            for bullets in (self.player_bullets, self.enemy_bullets)
+            for object in bullets
+            if object.is_offscreen(field)
         ]
         for object in offscreen_objects:
             self.remove_screen_object(object)
 
     def handle_enemy_and_player_bullet_collisions(self):
-        bullets = [
-            obj for obj in self.screen_objects if isinstance(obj, PlayerBullet)]
-        enemies = [
-            obj for obj in self.screen_objects if isinstance(obj, Enemy)]
-
-        # check if any bullets are inside any enemy hitboxes
-        for enemy in enemies:
-            # get enemy centre and radius
-            # find any bullet closer to centre than radius
-            # and remove bullet and enemy from screen
-            removed_bullets = []
-            for bullet in bullets:
-                if detect_collision(enemy, bullet):
-                    # play explosion sound for collision
-                    pygame.mixer.Sound.play(EXPLOSION_SOUND)
-
-                    # remove relevant objects from screen
-                    self.remove_screen_object(enemy)
-                    if bullet not in removed_bullets:
-                        self.remove_screen_object(bullet)
-                        removed_bullets.append(bullet)
-                    self.game_meta.increase_points(
-                        enemy.point_value
-                    )
+        bullets = self.player_bullets
+        if not bullets:
+            return
+        enemies = self.enemies
+
+        # find every hit first, then apply them, so an enemy hit by two
+        # bullets (or a bullet hitting two enemies) is only removed once
+        hit_enemies = {}
+        hit_bullets = {}
+        for enemy, bullet in self.find_collisions(enemies, bullets):
+            hit_enemies[enemy.id] = enemy
+            hit_bullets[bullet.id] = bullet
+
+        for enemy in hit_enemies.values():
+            # play explosion sound for collision
+            self.play_sound('explosion')
+            self.remove_screen_object(enemy)
+            self.game_meta.increase_points(enemy.point_value)
+        for bullet in hit_bullets.values():
+            self.remove_screen_object(bullet)
 
     def handle_player_and_enemy_bullet_collisions(self):
-        enemy_bullets = [
-            obj for obj in self.screen_objects if isinstance(obj, EnemyBullet)]
+        enemy_bullets = self.enemy_bullets
+        if not enemy_bullets:
+            return
 
         # expecting only one player but in case we decide to add multiplayer
         # keep the logic for handling multiple players at once
-        players = [
-            obj for obj in self.screen_objects if isinstance(obj, Player)]
-
-        for player in players:
-            for bullet in enemy_bullets:
-                if detect_collision(player, bullet):
-                    pygame.mixer.Sound.play(HURT_SOUND)
-                    # TODO - add temporary color change for player object
-                    self.game_meta.lose_life()
-                    self.game_meta.lose_points(50)
-                    self.remove_screen_object(bullet)
+        players = self.players
+
+        hit_bullets = {}
+        for player, bullet in self.find_collisions(players, enemy_bullets):
+            self.play_sound('hurt')
+            # TODO - add temporary color change for player object
+            self.game_meta.lose_life()
+            self.game_meta.lose_points(50)
+            hit_bullets[bullet.id] = bullet
+        for bullet in hit_bullets.values():
+            self.remove_screen_object(bullet)
+
+    def find_collisions(self, targets, bullets):
+        """Return (target, bullet) pairs that overlap.
+
+        Targets are bucketed into the collision grid so each bullet is
+        only tested against targets in the cells it touches.
+        """
+        grid = self.collision_grid
+        grid.clear()
+        for target in targets:
+            grid.insert(target)
+
+        collisions = []
+        for bullet in bullets:
+            for target in grid.query(bullet):
+                if detect_collision(target, bullet):
+                    collisions.append((target, bullet))
+        return collisions
 
     def register_screen_object(self, object):
-        self.screen_objects.append(object)
+        id = object.id
+        self.screen_objects[id] = object
+        if object.update_each_tick:
+            self.updatable[id] = object
+        for cls in index_classes(type(object)):
+            self.indexes[cls][id] = object
 
     def remove_screen_object(self, object):
-        self.screen_objects.remove(object)
+        id = object.id
+        del self.screen_objects[id]
+        self.updatable.pop(id, None)
+        for cls in index_classes(type(object)):
+            del self.indexes[cls][id]
+
+        for attr in ('timer', 'reload_timer'):
+            timer = getattr(object, attr, None)
+            if timer is not None:
+                timer.cancel()
+
+        if isinstance(object, Bullet):
+            self.screen_object_factory.release(object)
+
+        formation = getattr(object, 'formation', None)
+        if formation is not None:
+            formation.remove(object)
+            if not formation.enemies:
+                formation.timer.cancel()
+                self.formations.remove(formation)
+
+    def register_formation(self, formation):
+        formation.id = self.screen_object_factory.next_id()
+        # first move one recoil after it appears, not on the tick it spawns
+        formation.last_move_time = self.clock.get_ticks()
+        formation.schedule_move(self)
+        self.formations.append(formation)
 
     def display_home_screen(self):
         self.screen.blit(self.bg, (0, 0))
@@ -113,14 +256,36 @@ class ScreenHandler:
 
     @property
     def enemies_landed(self):
-        min_y_to_land = self.screen.get_height() - config['window']['bottom_buffer']
+        min_y_to_land = self.config.landing_y
+        # only look at enemies in formations whose lowest row is past the line
         enemies_landed = [
-            obj for obj in self.screen_objects
-            if isinstance(obj, Enemy)
+            obj
+            for formation in self.formations
+            if formation.lowest_y > min_y_to_land
+            for obj in formation.enemies.values()
             if obj.y > min_y_to_land
         ]
         return enemies_landed
 
     @property
     def enemies(self):
-        return [obj for obj in self.screen_objects if isinstance(obj, Enemy)]
+        return self.indexes[Enemy].values()
+
+    @property
+    def players(self):
+        return self.indexes[Player].values()
+
+    @property
+    def player_bullets(self):
+        return self.indexes[PlayerBullet].values()
+
+    @property
+    def enemy_bullets(self):
+        return self.indexes[EnemyBullet].values()
+
+    def entity_counts(self):
+        return {
+            'enemies': len(self.indexes[Enemy]),
+            'player_bullets': len(self.indexes[PlayerBullet]),
+            'enemy_bullets': len(self.indexes[EnemyBullet]),
+        }
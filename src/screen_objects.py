@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 from functools import cached_property
-import random
 
 import pygame
 
 from config import get_config
+from src.assets import ASSETS
+from src.entity_store import ENEMY_BULLET, PLAYER_BULLET, StoreColumn
 from src.helpers import clip_value
-
-config = get_config()
+from src.sprites import get_sprite
+from src.text import get_font, render_text
 
 # TODO - move all constants into a constants file
 # which handles font and sound inits?
@@ -21,36 +22,71 @@ PURPLE = (102, 0, 102)
 GREEN = (0, 255, 0)
 PINK = (220, 20, 60)
 
-PLAYER_SHOOTING_RECOIL_TIME = config['player']['bullet']['recoil']  # seconds
-ENEMY_SHOOTING_RECOIL_TIME = config['enemy']['bullet']['recoil']  # seconds
-# TODO - ^Make this variable for different levels of difficulty
-
-DEFAULT_FONT = pygame.font.get_default_font()
+# Gameplay settings are read from the handler's config when used, so
+# importing this module does not load config/conf.yaml.
+# TODO - make the recoil times variable for different levels of difficulty
 
-# Keep shoot sounds separate as likely will to change them to different
-# sounds down the line
-pygame.mixer.init()
-PLAYER_SHOOT_SOUND = pygame.mixer.Sound("data/sounds/shoot-sound.wav")
-PLAYER_SHOOT_SOUND.set_volume(4)
-ENEMY_SHOOT_SOUND = pygame.mixer.Sound("data/sounds/shoot-sound.wav")
-ENEMY_SHOOT_SOUND.set_volume(4)
-
-RED_INVADER = pygame.image.load('data/images/invaders-red.png')
-YELLOW_INVADER = pygame.image.load('data/images/invaders-yellow.gif')
+# None is pygame's bundled font, which SysFont also falls back to
+DEFAULT_FONT = None
 
 
 class ScreenObjectFactory:
+    # most spare bullets kept per type for reuse
+    max_pooled_bullets = 256
+
     def __init__(self, screen_handler):
         self.screen_handler = screen_handler
         self.id_counter = 0
+        self.bullet_pools = {
+            cls: [] for cls in (PlayerBullet, EnemyBullet, StoredPlayerBullet, StoredEnemyBullet)
+        }
 
-    def create(self, screen_object_cls, *args, **kwargs):
+    def next_id(self):
         self.id_counter += 1
-        return screen_object_cls(*args, id=self.id_counter, **kwargs)
+        return self.id_counter
+
+    def create(self, screen_object_cls, *args, id=None, **kwargs):
+        """Make an object with the next id, or `id` when rebuilding a saved one."""
+        if id is None:
+            id = self.next_id()
+        return screen_object_cls(*args, id=id, **kwargs)
+
+    def create_bullet(self, bullet_cls, x: int, y: int, vel: int, radius: int, id=None):
+        """Reuse a released bullet if there is one, otherwise make a new one."""
+        store = self.screen_handler.entity_store
+        if store is not None:
+            bullet_cls = STORED_BULLETS[bullet_cls]
+        if id is None:
+            id = self.next_id()
+
+        pool = self.bullet_pools[bullet_cls]
+        if pool:
+            obj = pool.pop()
+            obj.reset(x, y, vel, radius, id)
+        elif store is not None:
+            obj = self.create(bullet_cls, x, y, vel, radius, self.screen_handler.screen,
+                              id=id, store=store)
+        else:
+            obj = self.create(bullet_cls, x, y, vel, radius, self.screen_handler.screen, id=id)
+        self.screen_handler.register_screen_object(obj)
+        return obj
+
+    def release(self, obj):
+        """Take back a bullet that has left the screen so it can be reused."""
+        obj.deactivate()
+        pool = self.bullet_pools.get(type(obj))
+        if pool is not None and len(pool) < self.max_pooled_bullets:
+            pool.append(obj)
+        else:
+            obj.dispose()
 
     def create_player(self, x: int, y: int, vel: int, radius: int):
         args = [x, y, vel, radius, self.screen_handler.screen]
         obj = self.create(Player, *args)
+        # reloaded as if it had just shot, so players joining late wait too
+        screen_handler = self.screen_handler
+        obj.reload_timer = screen_handler.timers.schedule(
+            screen_handler.clock.get_ticks() + screen_handler.config.player.bullet.recoil, obj.reload)
         self.screen_handler.register_screen_object(obj)
         return obj
 
@@ -63,20 +99,15 @@ class ScreenObjectFactory:
     def create_shooting_enemy(self, x: int, y: int, vel: int, radius: int):
         args = [x, y, vel, radius, self.screen_handler.screen]
         obj = self.create(ShootingEnemy, *args)
+        obj.schedule_shot(self.screen_handler)
         self.screen_handler.register_screen_object(obj)
         return obj
 
     def create_player_bullet(self, x: int, y: int, vel: int, radius: int):
-        args = [x, y, vel, radius, self.screen_handler.screen]
-        obj = self.create(PlayerBullet, *args)
-        self.screen_handler.register_screen_object(obj)
-        return obj
+        return self.create_bullet(PlayerBullet, x, y, vel, radius)
 
     def create_enemy_bullet(self, x: int, y: int, vel: int, radius: int):
-        args = [x, y, vel, radius, self.screen_handler.screen]
-        obj = self.create(EnemyBullet, *args)
-        self.screen_handler.register_screen_object(obj)
-        return obj
+        return self.create_bullet(EnemyBullet, x, y, vel, radius)
 
     def create_score_box(self, x: int, y: int):
         args = [x, y, self.screen_handler.screen]
@@ -84,6 +115,12 @@ class ScreenObjectFactory:
         self.screen_handler.register_screen_object(obj)
         return obj
 
+    def create_profiler_overlay(self, profiler, x: int, y: int):
+        args = [profiler, x, y, self.screen_handler.screen]
+        obj = self.create(ProfilerOverlay, *args)
+        self.screen_handler.register_screen_object(obj)
+        return obj
+
     def create_end_game_box(self, message: str):
         args = [message, self.screen_handler.screen]
         obj = self.create(EndGameBox, *args)
@@ -98,6 +135,12 @@ class ScreenObjectFactory:
 
 
 class ScreenObject(ABC):
+    __slots__ = ('_id',)
+
+    # set for objects whose look can change without their rect moving
+    always_redraw: bool = False
+    # cleared for objects driven only by timers or the entity store
+    update_each_tick: bool = True
 
     def __init__(self, id):
         self._id = id
@@ -116,6 +159,7 @@ class ScreenObject(ABC):
 
 class Character(ScreenObject):
     """Do not instantiate child classes directly. Use the ScreenObjectFactory class."""
+    __slots__ = ('x', 'y', 'vel', 'radius', 'window', 'text')
 
     label: str = None
     label_rgb: tuple = None
@@ -128,37 +172,38 @@ class Character(ScreenObject):
         self.vel = vel
         self.radius = radius
         self.window = window
-        self.text = pygame.font.SysFont(DEFAULT_FONT, 20).render(
-            self.label, True, self.label_rgb
-        )
+        # bullets have no label, so skip the text entirely
+        self.text = render_text(DEFAULT_FONT, 20, self.label, self.label_rgb) if self.label else None
 
     @abstractmethod
     def update_state(self, screen_handler):
         pass
 
+    @property
+    def pixel(self):
+        """Position rounded to the pixel it is drawn at; x and y can be fractional."""
+        return round(self.x), round(self.y)
+
     def draw(self):
         # format and redraw window for updated state
-        text_coords = (self.x - self.text.get_width()//2,
-                       self.y - self.text.get_height()//2)
+        x, y = self.pixel
+        pygame.draw.circle(self.window, self.color, (x, y), self.radius)
 
-        pygame.draw.circle(self.window, self.color,
-                           (self.x, self.y), self.radius)
-        self.window.blit(self.text, text_coords)
+        if self.text is not None:
+            text_coords = (x - self.text.get_width()//2,
+                           y - self.text.get_height()//2)
+            self.window.blit(self.text, text_coords)
 
-    def is_offscreen(self):
-        max_y = self.window.get_height(
-        ) - config['window']['bottom_buffer']
-        min_y = config['window']['top_buffer']
+    def get_rect(self):
+        x, y = self.pixel
+        circle = pygame.Rect(x - self.radius, y - self.radius,
+                             2*self.radius + 1, 2*self.radius + 1)
+        if self.text is None:
+            return circle
+        return circle.union(self.text.get_rect(center=(x, y)))
 
-        max_x = self.window.get_width(
-        ) - config['window']['right_buffer']
-        min_x = config['window']['left_buffer']
-
-        if self.y > max_y or self.y < min_y:
-            return True
-        if self.x > max_x or self.x < min_x:
-            return True
-        return False
+    def is_offscreen(self, field):
+        return not field.contains(self.x, self.y)
 
 
 class Player(Character):
@@ -168,85 +213,94 @@ class Player(Character):
     label_rgb: tuple = WHITE
 
     def __init__(self, x: int, y: int, vel: int, radius: int, window: pygame.Surface, id: int):
-        self.last_bullet_time = 0
+        self.reloaded = False
+        self.reload_timer = None  # scheduled by the factory
+        self.bullet_id = None  # this player's last bullet, one in flight at a time
         super().__init__(x, y, vel, radius, window, id)
 
     def update_state(self, screen_handler):
-        keys = pygame.key.get_pressed()
+        keys = screen_handler.get_input(self)
 
-        if keys[pygame.K_LEFT]:
+        if keys.left:
             self.x -= self.vel
-        if keys[pygame.K_RIGHT]:
+        if keys.right:
             self.x += self.vel
-        if keys[pygame.K_SPACE]:
-            already_bullet_on_screen = any(
-                [x for x in screen_handler.screen_objects if isinstance(x, PlayerBullet)]
-            )
-            if not already_bullet_on_screen:
+        if keys.shoot:
+            if self.bullet_id not in screen_handler.indexes[PlayerBullet]:
                 self.shoot(screen_handler)
 
         # stop circle going out of the screen
-        min_x = self.radius + config['window']['left_buffer']
-        max_x = self.window.get_width() - self.radius - \
-            config['window']['right_buffer']
-        self.x = clip_value(self.x, min_x, max_x)
+        game_config = screen_handler.config
+        self.x = clip_value(self.x, game_config.player_min_x, game_config.player_max_x)
+
+    def reload(self):
+        self.reloaded = True
 
     def shoot(self, screen_handler):
-        # TODO - move this into init?
-        bullet_speed = config['player']['bullet']['speed']
-        bullet_radius = config['player']['bullet']['radius']
+        game_config = screen_handler.config
+        bullet_speed = game_config.player_bullet_vel
+        bullet_radius = game_config.player.bullet.radius
 
-        cur_time = pygame.time.get_ticks()
-        if cur_time - self.last_bullet_time > PLAYER_SHOOTING_RECOIL_TIME:
+        if self.reloaded:
 
             # play shooting sound effect
-            pygame.mixer.Sound.play(PLAYER_SHOOT_SOUND)
+            screen_handler.play_sound('player_shoot')
 
-            self.last_bullet_time = cur_time
+            self.reloaded = False
+            self.reload_timer = screen_handler.timers.schedule(
+                screen_handler.clock.get_ticks() + game_config.player.bullet.recoil, self.reload)
 
             # create a bullet object
-            screen_handler.screen_object_factory.create_player_bullet(
+            bullet = screen_handler.screen_object_factory.create_player_bullet(
                 self.x, self.y, bullet_speed, bullet_radius)
+            self.bullet_id = bullet.id
 
 
 class Enemy(Character):
-    """Trivial class for all enemies to inherit from."""
+    """Trivial class for all enemies to inherit from.
+
+    Enemies are moved by their Formation. Their position is stored
+    relative to it so the whole formation moves by changing one offset.
+    """
 
-    move_recoil = config['enemy']['move_recoil']
+    update_each_tick: bool = False
 
     def __init__(self, x: int, y: int, vel: int, radius: int, window: pygame.Surface, id: int):
-        self.direction = 1
-        self.move_counter = 0
-        self.move_counter_max_level = None
-        self.lead_enemy = None
-        self.last_move_time = 0
+        self.formation = None
         super().__init__(x, y, vel, radius, window, id)
 
-    @ cached_property
+    @property
+    def x(self):
+        if self.formation is None:
+            return self.grid_x
+        return self.grid_x + self.formation.offset_x
+
+    @x.setter
+    def x(self, value):
+        self.grid_x = value if self.formation is None else value - self.formation.offset_x
+
+    @property
+    def y(self):
+        if self.formation is None:
+            return self.grid_y
+        return self.grid_y + self.formation.offset_y
+
+    @y.setter
+    def y(self, value):
+        self.grid_y = value if self.formation is None else value - self.formation.offset_y
+
+    @property
     def img(self):
-        return pygame.transform.scale(self.raw_img, (2*self.radius, 2*self.radius))
+        return get_sprite(ASSETS.image(self.raw_img), (2*self.radius, 2*self.radius))
 
     def draw(self):
         self.window.blit(self.img, (self.x - self.radius, self.y - self.radius))
 
-    def set_move_counter_max_level(self, level: int):
-        self.move_counter_max_level = level
+    def get_rect(self):
+        return pygame.Rect(self.x - self.radius, self.y - self.radius, 2*self.radius, 2*self.radius)
 
     def update_state(self, screen_handler):
-        if self.move_counter is None:
-            raise ValueError("Move counter level must be set for enemy object post initialisation!")
-
-        cur_time = pygame.time.get_ticks()
-        if cur_time - self.last_move_time > self.move_recoil:
-            self.last_move_time = cur_time
-
-            if self.move_counter == self.move_counter_max_level:
-                self.y += self.vel  # move down
-                self.direction *= -1  # switch direction
-                self.move_counter = 0  # reset move counter
-            else:
-                self.x += self.direction * self.vel
-                self.move_counter += 1
+        pass
 
 
 class StandardEnemy(Enemy):
@@ -254,8 +308,11 @@ class StandardEnemy(Enemy):
     color: tuple = YELLOW
     label: str = 'X'
     label_rgb: tuple = BLACK
-    point_value = config['enemy']['standard_point_value']
-    raw_img = YELLOW_INVADER
+    raw_img = 'yellow_invader'
+
+    @property
+    def point_value(self):
+        return get_config().enemy.standard_point_value
 
 
 class ShootingEnemy(Enemy):
@@ -263,84 +320,221 @@ class ShootingEnemy(Enemy):
     color: tuple = GREEN
     label: str = 'X'
     label_rgb: tuple = BLACK
-    point_value = config['enemy']['shooter_point_value']
-    shooting_freq = config['enemy']['shooting_frequency']
-    raw_img = RED_INVADER
+    raw_img = 'red_invader'
+
+    @property
+    def point_value(self):
+        return get_config().enemy.shooter_point_value
 
     def __init__(self, x: int, y: int, vel: int, radius: int, window: pygame.Surface, id: int):
         super().__init__(x, y, vel, radius, window, id)
-        self.last_bullet_time = pygame.time.get_ticks()
-
-    def update_state(self, screen_handler):
-        super().update_state(screen_handler)
+        self.timer = None  # scheduled by the factory
 
-        recoil = ENEMY_SHOOTING_RECOIL_TIME + 1000 * (2 * random.random() - 1)
+    def schedule_shot(self, screen_handler):
+        """Draw a randomised recoil and book the next chance to shoot after it."""
+        clock = screen_handler.clock
+        recoil = screen_handler.config.enemy.bullet.recoil + 1000 * (2 * clock.random() - 1)
+        self.timer = screen_handler.timers.schedule(
+            clock.get_ticks() + recoil, self.try_to_shoot, screen_handler)
 
-        cur_time = pygame.time.get_ticks()
-        if cur_time - self.last_bullet_time > recoil:
-            if random.random() < self.shooting_freq:
-                self.shoot(screen_handler)
-            self.last_bullet_time = cur_time
+    def try_to_shoot(self, screen_handler):
+        if screen_handler.clock.random() < screen_handler.config.enemy.shooting_frequency:
+            self.shoot(screen_handler)
+        self.schedule_shot(screen_handler)
 
     def shoot(self, screen_handler):
-        bullet_speed = config['enemy']['bullet']['speed']
-        bullet_radius = config['enemy']['bullet']['radius']
+        bullet_speed = screen_handler.config.enemy_bullet_vel
+        bullet_radius = screen_handler.config.enemy.bullet.radius
 
         # play shooting sound effect
-        pygame.mixer.Sound.play(ENEMY_SHOOT_SOUND)
+        screen_handler.play_sound('enemy_shoot')
 
         # create a bullet object
         screen_handler.screen_object_factory.create_enemy_bullet(
             self.x, self.y, bullet_speed, bullet_radius)
 
 
-class PlayerBullet(Character):
+class Bullet(Character):
+    """Unlabelled, slotted character that the factory pools and reuses."""
+    __slots__ = ()
 
-    color: tuple = RED
     label: str = ''
     label_rgb: tuple = BLACK
 
+    def reset(self, x: int, y: int, vel: int, radius: int, id: int):
+        self._id = id
+        self.x = x
+        self.y = y
+        self.vel = vel
+        self.radius = radius
+
+    def deactivate(self):
+        pass
+
+    def dispose(self):
+        pass
+
+
+class PlayerBullet(Bullet):
+    __slots__ = ()
+
+    color: tuple = RED
+
     def update_state(self, screen_handler):
         self.y -= self.vel
 
 
-class EnemyBullet(Character):
+class EnemyBullet(Bullet):
+    __slots__ = ()
 
     color: tuple = WHITE
-    label: str = ''
-    label_rgb: tuple = BLACK
 
     def update_state(self, screen_handler):
         self.y += self.vel
 
 
+class StoredBullet(Bullet):
+    """Bullet whose state lives in the screen handler's EntityStore.
+
+    The store moves all stored bullets at once, so update_state does
+    nothing. Fields are read and written through the store's arrays.
+    """
+    __slots__ = ('store', 'slot')
+
+    update_each_tick: bool = False
+
+    kind: int = None
+    heading: int = 0
+
+    x = StoreColumn('x')
+    y = StoreColumn('y')
+    vel = StoreColumn('vel')
+    radius = StoreColumn('radius')
+
+    def __init__(self, x: int, y: int, vel: int, radius: int, window: pygame.Surface, id: int,
+                 store):
+        self.store = store
+        self.slot = store.allocate(self, self.kind)
+        store.activate(self.slot, self.heading)
+        super().__init__(x, y, vel, radius, window, id)
+
+    def update_state(self, screen_handler):
+        pass
+
+    def reset(self, x: int, y: int, vel: int, radius: int, id: int):
+        super().reset(x, y, vel, radius, id)
+        self.store.activate(self.slot, self.heading)
+
+    def deactivate(self):
+        self.store.deactivate(self.slot)
+
+    def dispose(self):
+        self.store.free(self.slot)
+
+
+class StoredPlayerBullet(StoredBullet, PlayerBullet):
+    __slots__ = ()
+
+    kind: int = PLAYER_BULLET
+    heading: int = -1
+
+
+class StoredEnemyBullet(StoredBullet, EnemyBullet):
+    __slots__ = ()
+
+    kind: int = ENEMY_BULLET
+    heading: int = 1
+
+
+STORED_BULLETS = {PlayerBullet: StoredPlayerBullet, EnemyBullet: StoredEnemyBullet}
+
+
 class ScoreBox(ScreenObject):
 
     font = DEFAULT_FONT
     size = 25
     color = WHITE
+    always_redraw = True
 
     def __init__(self, x: int, y: int, window: pygame.Surface, id: int):
         super().__init__(id)
         self.window = window
         self.x = x
         self.y = y
+        self.score = None
+        self.lives = None
+
+    def update_state(self, screen_handler):
+        score = screen_handler.game_meta.points
+        lives = screen_handler.game_meta.lives
+
+        # only re-render the text when the values change
+        if score != self.score:
+            self.score = score
+            self.score_box = render_text(self.font, self.size, f"Score: {score}", self.color)
+        if lives != self.lives:
+            self.lives = lives
+            self.lives_box = render_text(self.font, self.size, f"Lives: {lives}", self.color)
+
+    def draw(self):
+        pygame.draw.rect(self.window, BLACK, self.get_rect())
+        self.window.blit(self.score_box, (self.x, self.y))
+        self.window.blit(self.lives_box, (self.x, self.y + self.size))
+
+    @cached_property
+    def line_height(self):
+        return get_font(self.font, self.size).get_height()
+
+    def get_rect(self):
+        height = self.line_height + self.size + 2*self.y
+        return pygame.Rect(0, 0, self.window.get_width(), height)
+
+
+class ProfilerOverlay(ScreenObject):
+    """Shows the previous frame's timings and entity counts in the top bar."""
+
+    font = DEFAULT_FONT
+    size = 16
+    color = GREEN
+    always_redraw = True
+
+    def __init__(self, profiler, x: int, y: int, window: pygame.Surface, id: int):
+        super().__init__(id)
+        self.profiler = profiler
+        self.window = window
+        self.x = x
+        self.y = y
+        self.lines = []
 
     def update_state(self, screen_handler):
-        self.score = screen_handler.game_meta.points
-        self.lives = screen_handler.game_meta.lives
+        phases = self.profiler.last_frame
+        counts = self.profiler.counts
+
+        def ms(*names):
+            return sum(phases.get(name, 0.0) for name in names)
+
+        text = [
+            f"frame {self.profiler.frame_ms:.1f} ms",
+            f"coll {ms('player_collisions', 'enemy_collisions'):.1f} "
+            f"upd {ms('update'):.1f} draw {ms('draw'):.1f}",
+            f"present {ms('present'):.1f} tick {ms('tick'):.1f}",
+            f"enemies {counts.get('enemies', 0)} "
+            f"bullets {counts.get('player_bullets', 0) + counts.get('enemy_bullets', 0)}",
+        ]
+        # the numbers change every frame, so don't fill the shared text cache
+        font = get_font(self.font, self.size)
+        self.lines = [font.render(line, True, self.color) for line in text]
 
     def draw(self):
-        score_box = pygame.font.SysFont(self.font, self.size).render(
-            f"Score: {self.score}", True, self.color
-        )
-        lives_box = pygame.font.SysFont(self.font, self.size).render(
-            f"Lives: {self.lives}", True, self.color
-        )
-        height = lives_box.get_height() + self.size + 2*self.y
-        pygame.draw.rect(self.window, BLACK, pygame.Rect(0, 0, self.window.get_width(), height))
-        self.window.blit(score_box, (self.x, self.y))
-        self.window.blit(lives_box, (self.x, self.y + self.size))
+        y = self.y
+        for line in self.lines:
+            self.window.blit(line, (self.x, y))
+            y += line.get_height()
+
+    def get_rect(self):
+        width = max((line.get_width() for line in self.lines), default=0)
+        height = sum(line.get_height() for line in self.lines)
+        return pygame.Rect(self.x, self.y, width, height)
 
 
 class EndGameBox(ScreenObject):
@@ -363,13 +557,8 @@ class EndGameBox(ScreenObject):
     def draw(self, score):
         msg_size = 50
         score_box_size = 25
-        msg = pygame.font.SysFont(self.font, msg_size).render(
-            self.message, True, self.color
-        )
-
-        score_box = pygame.font.SysFont(self.font, score_box_size).render(
-            f"Score: {score}", True, self.color
-        )
+        msg = render_text(self.font, msg_size, self.message, self.color)
+        score_box = render_text(self.font, score_box_size, f"Score: {score}", self.color)
 
         # Get new coords for score to be centred under message
         # self.x and self.y are centre of screen
@@ -406,13 +595,8 @@ class StartGameBox(ScreenObject):
         pass
 
     def draw(self):
-        title = pygame.font.SysFont(self.title_font, self.title_size).render(
-            self.title, True, self.title_color
-        )
-
-        msg = pygame.font.SysFont(self.msg_font, self.msg_size).render(
-            self.message, True, self.msg_color
-        )
+        title = render_text(self.title_font, self.title_size, self.title, self.title_color)
+        msg = render_text(self.msg_font, self.msg_size, self.message, self.msg_color)
 
         # Get new coords for score to be centred under message
         # self.x and self.y are centre of screen
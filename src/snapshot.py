@@ -0,0 +1,241 @@
+"""Compact binary checkpoints of a running game.
+
+`save_state` packs everything needed to carry on exactly: clock and RNG
+state, score and lives, wave progress, formations, and each entity's
+type, id, position, speed and pending timer. `restore_state` rebuilds
+that game in a ScreenHandler. Entities are plain struct records, so no
+surfaces or fonts are serialised and restoring costs a few object
+constructions per entity.
+
+Pending timers keep their order. Timers due at the same moment fire in
+the same order after a restore as they would have without it, so a
+restored game replays identically for the same input.
+
+Only game objects are saved. UI extras such as the profiler overlay or
+the start and end boxes are not.
+"""
+import struct
+
+from src.formations import Formation
+from src.screen_objects import (
+    EnemyBullet,
+    Player,
+    PlayerBullet,
+    ScoreBox,
+    ShootingEnemy,
+    StandardEnemy,
+)
+from src.waves import WaveScheduler, iter_waves
+
+MAGIC = b'SISN'
+VERSION = 2  # 2: positions and speeds as doubles
+
+HEADER = struct.Struct('<4sBQqIihBBHqHI')
+RNG_STATE = struct.Struct('<625IBd')
+FORMATION = struct.Struct('<IiibhhiiiqdQ')
+ENTITY = struct.Struct('<BIdddhIBdQ')
+
+# Entity types
+PLAYER = 1
+STANDARD_ENEMY = 2
+SHOOTING_ENEMY = 3
+PLAYER_BULLET = 4
+ENEMY_BULLET = 5
+SCORE_BOX = 6
+
+# GameMeta flags
+BEING_PLAYED = 1
+LOST = 2
+WON = 4
+
+# Wave scheduler flags
+HAS_SCHEDULER = 1
+WAITING_FOR_WAVE = 2
+
+NO_TIMER = 2**64 - 1
+
+
+SAVED_TYPES = (
+    (Player, PLAYER),
+    (ShootingEnemy, SHOOTING_ENEMY),
+    (StandardEnemy, STANDARD_ENEMY),
+    (PlayerBullet, PLAYER_BULLET),
+    (EnemyBullet, ENEMY_BULLET),
+    (ScoreBox, SCORE_BOX),
+)
+ENTITY_TYPES = {}  # concrete type -> entity type, or None if not saved
+
+
+def entity_type(obj):
+    obj_type = type(obj)
+    try:
+        return ENTITY_TYPES[obj_type]
+    except KeyError:
+        kind = next((kind for cls, kind in SAVED_TYPES if issubclass(obj_type, cls)), None)
+        ENTITY_TYPES[obj_type] = kind
+        return kind
+
+
+def timer_fields(timer, sequence):
+    """(due, sequence) of a pending timer, or a blank pair."""
+    if timer is None or timer.cancelled:
+        return 0.0, NO_TIMER
+    return timer.due, sequence[timer]
+
+
+def whole(value: float):
+    """`value` as an int if it is a whole number, as the game makes most positions."""
+    return int(value) if value.is_integer() else value
+
+
+def save_state(screen_handler) -> bytes:
+    sh = screen_handler
+    game_meta = sh.game_meta
+    clock = sh.clock
+    # position of each pending timer in firing order. Cancelled timers wait in
+    # the heap until they come up, so leave them out to keep the bytes canonical.
+    live = sorted(entry for entry in sh.timers.heap if not entry[2].cancelled)
+    sequence = {timer: rank for rank, (_, _, timer) in enumerate(live)}
+
+    meta_flags = ((BEING_PLAYED if game_meta.game_being_played else 0)
+                  | (LOST if game_meta.lost_state else 0)
+                  | (WON if game_meta.won_state else 0))
+    scheduler = sh.wave_scheduler
+    wave_flags, wave_number, next_wave_time = 0, 0, 0
+    if scheduler is not None:
+        wave_flags = HAS_SCHEDULER
+        wave_number = scheduler.wave_number
+        if scheduler.next_wave_time is not None:
+            wave_flags |= WAITING_FOR_WAVE
+            next_wave_time = scheduler.next_wave_time
+
+    # player bullets keep their shooter in the ref field
+    shooters = {player.bullet_id: player.id for player in sh.players if player.bullet_id}
+    records = []
+    for obj in sh.screen_objects.values():
+        kind = entity_type(obj)
+        if kind is None:
+            continue
+        ref, flags, timer = 0, 0, None
+        if kind == SCORE_BOX:
+            x, y, vel, radius = obj.x, obj.y, 0, 0
+        elif kind in (STANDARD_ENEMY, SHOOTING_ENEMY):
+            x, y, vel, radius = obj.grid_x, obj.grid_y, obj.vel, obj.radius
+            ref = obj.formation.id if obj.formation is not None else 0
+            timer = getattr(obj, 'timer', None)
+        else:
+            x, y, vel, radius = obj.x, obj.y, obj.vel, obj.radius
+            if kind == PLAYER_BULLET:
+                ref = shooters.get(obj.id, 0)
+            elif kind == PLAYER:
+                flags = int(obj.reloaded)
+                timer = obj.reload_timer
+        records.append(ENTITY.pack(kind, obj.id, x, y, vel, radius, ref, flags,
+                                   *timer_fields(timer, sequence)))
+
+    formations = [
+        FORMATION.pack(f.id, f.offset_x, f.offset_y, f.direction, f.vel, f.radius, f.min_x,
+                       f.max_x, f.move_recoil, f.last_move_time,
+                       *timer_fields(f.timer, sequence))
+        for f in sh.formations
+    ]
+
+    _, rng_words, gauss_next = clock.rng.getstate()
+    header = HEADER.pack(
+        MAGIC, VERSION, clock.tick_count, clock.time, sh.screen_object_factory.id_counter,
+        game_meta.points, game_meta.lives, meta_flags, wave_flags, wave_number, next_wave_time,
+        len(formations), len(records),
+    )
+    rng = RNG_STATE.pack(*rng_words, gauss_next is not None, gauss_next or 0.0)
+    return b''.join([header, rng, *formations, *records])
+
+
+def restore_state(screen_handler, data: bytes):
+    """Replace the game in `screen_handler` with the one saved in `data`."""
+    (magic, version, tick_count, time, id_counter, points, lives, meta_flags, wave_flags,
+     wave_number, next_wave_time, n_formations, n_entities) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a game snapshot (or from an unsupported version)")
+    offset = HEADER.size
+    *rng_words, has_gauss, gauss_next = RNG_STATE.unpack_from(data, offset)
+    offset += RNG_STATE.size
+
+    sh = screen_handler
+    sh.clear_objects_from_screen()
+
+    clock = sh.clock
+    clock.tick_count = tick_count
+    clock.time = time
+    clock.rng.setstate((3, tuple(rng_words), gauss_next if has_gauss else None))
+
+    game_meta = sh.game_meta
+    game_meta.points = points
+    game_meta.lives = lives
+    game_meta.game_being_played = bool(meta_flags & BEING_PLAYED)
+    game_meta.lost_state = bool(meta_flags & LOST)
+    game_meta.won_state = bool(meta_flags & WON)
+
+    sh.wave_scheduler = None
+    if wave_flags & HAS_SCHEDULER:
+        waves = sh.config.waves
+        scheduler = sh.wave_scheduler = WaveScheduler(iter_waves(waves), waves.delay)
+        scheduler.skip_waves(wave_number)
+        scheduler.next_wave_time = next_wave_time if wave_flags & WAITING_FOR_WAVE else None
+
+    # (rank, due, owner, owner attribute, callback, args), rescheduled in rank order
+    timers = []
+    formations = {}
+    for (id, offset_x, offset_y, direction, vel, radius, min_x, max_x, move_recoil,
+         last_move_time, due, seq) in FORMATION.iter_unpack(
+            data[offset:offset + n_formations * FORMATION.size]):
+        formation = Formation(vel, radius, min_x, max_x, move_recoil)
+        formation.id = id
+        formation.offset_x, formation.offset_y = offset_x, offset_y
+        formation.direction = direction
+        formation.last_move_time = last_move_time
+        if seq != NO_TIMER:
+            timers.append((seq, due, formation, 'timer', formation.update_state, (sh,)))
+        sh.formations.append(formation)
+        formations[id] = formation
+    offset += n_formations * FORMATION.size
+
+    factory = sh.screen_object_factory
+    screen = sh.screen
+    shooters = {}  # player id -> id of its bullet in flight
+    for kind, id, x, y, vel, radius, ref, flags, due, seq in ENTITY.iter_unpack(
+            data[offset:offset + n_entities * ENTITY.size]):
+        # positions are saved as doubles, so give whole ones back their int type
+        x, y, vel = whole(x), whole(y), whole(vel)
+        if kind == PLAYER_BULLET:
+            factory.create_bullet(PlayerBullet, x, y, vel, radius, id=id)
+            if ref:
+                shooters[ref] = id
+            continue
+        if kind == ENEMY_BULLET:
+            factory.create_bullet(EnemyBullet, x, y, vel, radius, id=id)
+            continue
+
+        if kind == SCORE_BOX:
+            obj = factory.create(ScoreBox, x, y, screen, id=id)
+        elif kind == PLAYER:
+            obj = factory.create(Player, x, y, vel, radius, screen, id=id)
+            obj.reloaded = bool(flags)
+            if seq != NO_TIMER:
+                timers.append((seq, due, obj, 'reload_timer', obj.reload, ()))
+        else:
+            cls = ShootingEnemy if kind == SHOOTING_ENEMY else StandardEnemy
+            obj = factory.create(cls, x, y, vel, radius, screen, id=id)
+            if ref:
+                formations[ref].add(obj)
+            if seq != NO_TIMER:
+                timers.append((seq, due, obj, 'timer', obj.try_to_shoot, (sh,)))
+        sh.register_screen_object(obj)
+
+    for player in sh.players:
+        player.bullet_id = shooters.get(player.id)
+    for _, due, owner, attr, callback, args in sorted(timers, key=lambda timer: timer[0]):
+        setattr(owner, attr, sh.timers.schedule(due, callback, *args))
+    factory.id_counter = id_counter
+
+    if 'renderer' in sh.__dict__:
+        sh.renderer.invalidate()
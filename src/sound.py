@@ -0,0 +1,87 @@
+import queue
+import threading
+import time
+
+from src.assets import ASSETS
+
+
+# Shortest gap, in ms of wall time, between two plays of the same sound
+RATE_LIMITS = {
+    'explosion': 60,
+    'hurt': 100,
+    'player_shoot': 0,
+    'enemy_shoot': 80,
+}
+
+
+class NullSoundDispatcher:
+    """Drops every sound, so callers can post without checking whether sound is on."""
+
+    enabled = False
+
+    def post(self, name):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_SOUNDS = NullSoundDispatcher()
+
+
+class SoundDispatcher:
+    """Collects the sounds game logic asks for and plays them off the game loop.
+
+    `post` only records the name, so a sound asked for many times in one
+    frame is queued once. `flush` hands the frame's sounds to a worker
+    thread, which loads and plays them and skips any sound played more
+    recently than its rate limit allows.
+    """
+
+    enabled = True
+
+    def __init__(self, rate_limits=RATE_LIMITS, assets=ASSETS):
+        self.rate_limits = rate_limits
+        self.assets = assets
+        self.pending = {}  # names in the order first posted this frame
+        self.queue = queue.SimpleQueue()
+        self.last_played = {}
+        self.thread = None
+
+    def post(self, name: str):
+        self.pending[name] = None
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.queue.put(tuple(self.pending))
+        self.pending = {}
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            names = self.queue.get()
+            if names is None:
+                return
+            now = time.perf_counter()
+            for name in names:
+                last = self.last_played.get(name)
+                if last is not None and 1000 * (now - last) < self.rate_limits.get(name, 0):
+                    continue
+                self.last_played[name] = now
+                self.assets.sound(name).play()
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+
+def create_sound_dispatcher(enabled=True):
+    return SoundDispatcher() if enabled else NULL_SOUNDS
@@ -0,0 +1,39 @@
+from collections import defaultdict
+
+
+class SpatialHash:
+    """Uniform grid that buckets circular objects by the cells they overlap.
+
+    Objects need `id`, `x`, `y` and `radius` attributes. Rebuild it with
+    `clear` and `insert` whenever the objects move, then `query` returns
+    the candidates near a given object without scanning all of them.
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+
+    def clear(self):
+        self.cells.clear()
+
+    def cells_for(self, obj):
+        size = self.cell_size
+        min_cx = int(obj.x - obj.radius) // size
+        max_cx = int(obj.x + obj.radius) // size
+        min_cy = int(obj.y - obj.radius) // size
+        max_cy = int(obj.y + obj.radius) // size
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                yield cx, cy
+
+    def insert(self, obj):
+        for cell in self.cells_for(obj):
+            self.cells[cell].append(obj)
+
+    def query(self, obj):
+        """Return the objects sharing at least one cell with `obj`, each once."""
+        found = {}
+        for cell in self.cells_for(obj):
+            for other in self.cells.get(cell, ()):
+                found[other.id] = other
+        return found.values()
@@ -0,0 +1,41 @@
+import pygame
+
+
+class SpriteCache:
+    """Scaled copies of source images, shared by every object that uses them.
+
+    Sprites are keyed by (source image, size) so, for example, all enemies
+    of one type blit the same surface. Once the window exists
+    `use_display_format` converts them to the display's pixel format, which
+    makes blitting them much cheaper. Without a display, e.g. after
+    `pygame.quit()`, new sprites are left unconverted.
+    """
+
+    def __init__(self):
+        self.sprites = {}
+
+    def get(self, image: pygame.Surface, size: tuple, alpha=True) -> pygame.Surface:
+        key = (image, size, alpha)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.prepare(pygame.transform.scale(image, size), alpha)
+            self.sprites[key] = sprite
+        return sprite
+
+    def prepare(self, surface: pygame.Surface, alpha: bool) -> pygame.Surface:
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def use_display_format(self):
+        """Call once the display mode is set. Converts anything already cached."""
+        self.sprites = {
+            key: self.prepare(sprite, key[2]) for key, sprite in self.sprites.items()
+        }
+
+
+SPRITES = SpriteCache()
+
+
+def get_sprite(image: pygame.Surface, size: tuple, alpha=True) -> pygame.Surface:
+    return SPRITES.get(image, size, alpha)
@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+import pygame
+
+
+# SysFont scans the system font list, so only ever build each font once
+@lru_cache(maxsize=32)
+def get_font(name: str, size: int) -> pygame.font.Font:
+    return pygame.font.SysFont(name, size)
+
+
+@lru_cache(maxsize=256)
+def render_text(font: str, size: int, text: str, color: tuple) -> pygame.Surface:
+    """Antialiased text surface, shared between callers.
+
+    The returned surface is cached so it must not be drawn on.
+    """
+    return get_font(font, size).render(text, True, color)
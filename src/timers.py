@@ -0,0 +1,59 @@
+import heapq
+import itertools
+
+
+class Timer:
+    """Handle for a scheduled callback. Cancelled timers stay in the heap
+    until they come up, then are skipped."""
+    __slots__ = ('due', 'callback', 'args')
+
+    def __init__(self, due, callback, args):
+        self.due = due
+        self.callback = callback
+        self.args = args
+
+    @property
+    def cancelled(self):
+        return self.callback is None
+
+    def cancel(self):
+        self.callback = None
+        self.args = ()
+
+
+class TimerQueue:
+    """Game-time events kept in a heap, ordered by due time.
+
+    A timer fires on the first `fire_expired(now)` call with `now` past
+    its due time, the same as the `now - last > recoil` checks it
+    replaces. Timers due at the same time fire in the order they were
+    scheduled, so a seeded game stays deterministic.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, due, callback, *args) -> Timer:
+        timer = Timer(due, callback, args)
+        heapq.heappush(self.heap, (due, next(self.counter), timer))
+        return timer
+
+    def fire_expired(self, now) -> int:
+        """Run every timer that expired before `now`. Returns how many ran."""
+        heap = self.heap
+        fired = 0
+        while heap and heap[0][0] < now:
+            timer = heapq.heappop(heap)[2]
+            if timer.callback is not None:
+                callback, args = timer.callback, timer.args
+                timer.cancel()  # spent
+                callback(*args)
+                fired += 1
+        return fired
+
+    def clear(self):
+        self.heap = []
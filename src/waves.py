@@ -0,0 +1,55 @@
+from itertools import cycle
+
+from src.formations import build_enemy_formation
+
+
+def iter_waves(waves_config):
+    """Yield the wave formations from the config, forever in endless mode."""
+    waves = waves_config.formations
+    if waves_config.endless:
+        yield from cycle(waves)
+    else:
+        yield from waves
+
+
+class WaveScheduler:
+    """Sends in enemy formations one wave at a time.
+
+    A wave's enemies are only created when it starts, which is `delay`
+    ms of game time after the previous wave was cleared, so the waves
+    can come from an endless generator.
+    """
+
+    def __init__(self, waves, delay: int):
+        self.waves = iter(waves)
+        self.upcoming = next(self.waves, None)
+        self.delay = delay
+        self.wave_number = 0
+        self.next_wave_time = None
+
+    @property
+    def finished(self):
+        return self.upcoming is None
+
+    def start_next_wave(self, screen_handler):
+        wave = self.upcoming
+        self.upcoming = next(self.waves, None)
+        self.wave_number += 1
+        self.next_wave_time = None
+        return build_enemy_formation(screen_handler, wave.nrows, wave.ncols)
+
+    def skip_waves(self, count: int):
+        """Move past `count` waves without starting them, e.g. when restoring a game."""
+        for _ in range(count):
+            self.upcoming = next(self.waves, None)
+        self.wave_number += count
+
+    def update_state(self, screen_handler):
+        if self.finished or screen_handler.enemies:
+            return
+
+        cur_time = screen_handler.clock.get_ticks()
+        if self.next_wave_time is None:
+            self.next_wave_time = cur_time + self.delay
+        elif cur_time >= self.next_wave_time:
+            self.start_next_wave(screen_handler)
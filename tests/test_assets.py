@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from src.assets import IMAGE_FILES, AssetManager  # noqa: E402
+
+
+class TestAssetManager(unittest.TestCase):
+    def setUp(self):
+        self.assets = AssetManager()
+        self.load = mock.patch('pygame.image.load', wraps=pygame.image.load).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_nothing_loads_until_first_access(self):
+        self.assertEqual(self.load.call_count, 0)
+        self.assets.image('background')
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_repeated_access_returns_the_same_image(self):
+        first = self.assets.image('red_invader')
+        self.assertIs(self.assets.image('red_invader'), first)
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_preloaded_images_are_not_loaded_again(self):
+        self.assets.preload_in_background(sounds=False)
+        self.assets.wait_for_preload()
+        self.assertEqual(self.load.call_count, len(IMAGE_FILES))
+        for name in IMAGE_FILES:
+            self.assets.image(name)
+        self.assertEqual(self.load.call_count, len(IMAGE_FILES))
+
+
+class TestImportCost(unittest.TestCase):
+    def test_importing_the_game_loads_nothing(self):
+        # a fresh interpreter, since other tests have loaded things already
+        code = (
+            "import pygame\n"
+            "import src.screen\n"
+            "from config import get_config\n"
+            "from src.assets import ASSETS\n"
+            "assert get_config.cache_info().currsize == 0, 'config loaded'\n"
+            "assert not ASSETS.cache, 'assets loaded'\n"
+            "assert not pygame.mixer.get_init(), 'mixer started'\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
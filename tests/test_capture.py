@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pygame
+
+from src.capture import FrameCapture
+
+
+def frame(color):
+    surface = pygame.Surface((4, 3))
+    surface.fill(color)
+    return surface
+
+
+class TestFrameCapture(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_png_sequence(self):
+        capture = FrameCapture(self.directory, (4, 3), format='png')
+        for color in ((255, 0, 0), (0, 255, 0)):
+            self.assertTrue(capture.capture(frame(color)))
+        capture.close()
+        self.assertEqual(sorted(os.listdir(self.directory)), ['frame_000000.png', 'frame_000001.png'])
+        image = pygame.image.load(os.path.join(self.directory, 'frame_000001.png'))
+        self.assertEqual(image.get_at((2, 1)), (0, 255, 0))
+
+    def test_raw_frames_are_written_in_order(self):
+        capture = FrameCapture(self.directory, (4, 3), format='raw', workers=3, block=True)
+        colors = [(i, 2 * i, 3 * i) for i in range(20)]
+        for color in colors:
+            capture.capture(frame(color))
+        capture.close()
+        with open(os.path.join(self.directory, 'frames.rgb'), 'rb') as f:
+            data = f.read()
+        self.assertEqual(len(data), 20 * 4 * 3 * 3)
+        self.assertEqual([tuple(data[i * 36:i * 36 + 3]) for i in range(20)], colors)
+
+    def test_drops_frames_when_every_buffer_is_busy(self):
+        capture = FrameCapture(self.directory, (4, 3), buffers=1)
+        busy = capture.free.get()  # as if an encoder still held it
+        self.assertFalse(capture.capture(frame((0, 0, 0))))
+        self.assertEqual(capture.dropped, 1)
+        capture.free.put(busy)
+        self.assertTrue(capture.capture(frame((0, 0, 0))))
+        capture.close()
+        self.assertEqual((capture.frame_count, capture.dropped), (1, 1))
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            FrameCapture(self.directory, (4, 3), format='gif')
+
+    def test_encoding_errors_wait_for_close(self):
+        capture = FrameCapture(self.directory, (4, 3), block=True)
+        with mock.patch('pygame.image.save', side_effect=OSError('disk full')):
+            capture.capture(frame((0, 0, 0)))
+            capture.finish()
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            capture.close()
@@ -0,0 +1,24 @@
+import unittest
+
+from src.clock import SimulationClock
+
+
+class TestSimulationClock(unittest.TestCase):
+    def test_time_advances_by_step(self):
+        clock = SimulationClock(step_ms=50, seed=1)
+        self.assertEqual(clock.get_ticks(), 0)
+        clock.tick()
+        clock.tick()
+        self.assertEqual(clock.get_ticks(), 100)
+        self.assertEqual(clock.tick_count, 2)
+
+    def test_same_seed_same_randoms(self):
+        first = SimulationClock(step_ms=50, seed=7)
+        second = SimulationClock(step_ms=50, seed=7)
+        self.assertEqual(
+            [first.random() for _ in range(5)],
+            [second.random() for _ in range(5)]
+        )
+
+    def test_seed_chosen_when_missing(self):
+        self.assertIsNotNone(SimulationClock(step_ms=50).seed)
@@ -0,0 +1,78 @@
+import copy
+import unittest
+
+import yaml
+
+from config.schema import ConfigError, compile_config
+
+with open('config/conf.yaml') as f:
+    RAW = yaml.safe_load(f)
+
+
+def raw_config(**changes):
+    """The shipped config with `section={key: value}` overrides applied."""
+    raw = copy.deepcopy(RAW)
+    for section, values in changes.items():
+        raw[section].update(values)
+    return raw
+
+
+class TestCompileConfig(unittest.TestCase):
+    def test_derives_play_field_and_limits(self):
+        config = compile_config(raw_config(
+            window={'width': 300, 'height': 200, 'left_buffer': 10, 'right_buffer': 20,
+                    'top_buffer': 30, 'bottom_buffer': 5},
+            player={'radius': 15},
+        ))
+        field = config.play_field
+        self.assertEqual((field.left, field.right, field.top, field.bottom), (10, 280, 30, 195))
+        self.assertEqual(config.landing_y, 195)
+        self.assertEqual((config.player_min_x, config.player_max_x), (25, 265))
+
+    def test_config_is_frozen(self):
+        config = compile_config(raw_config())
+        with self.assertRaises(AttributeError):
+            config.window.width = 10
+
+    def test_wrong_type_names_the_setting(self):
+        with self.assertRaisesRegex(ConfigError, r'^window\.width: expected int'):
+            compile_config(raw_config(window={'width': 'wide'}))
+
+    def test_missing_and_unknown_settings(self):
+        raw = raw_config()
+        del raw['enemy']['bullet']['speed']
+        with self.assertRaisesRegex(ConfigError, r'^enemy\.bullet\.speed: missing'):
+            compile_config(raw)
+        with self.assertRaisesRegex(ConfigError, 'unknown setting.*colour'):
+            compile_config(raw_config(player={'colour': 'red'}))
+
+    def test_range_checks(self):
+        with self.assertRaisesRegex(ConfigError, r'^clock\.step_ms: must be at least 1'):
+            compile_config(raw_config(clock={'step_ms': 0}))
+        with self.assertRaisesRegex(ConfigError, r'^clock\.seed: must be at least 0'):
+            compile_config(raw_config(clock={'seed': -1}))
+        with self.assertRaisesRegex(ConfigError, r'^clock\.seed: must be at most'):
+            compile_config(raw_config(clock={'seed': 2**64}))
+        with self.assertRaisesRegex(ConfigError, 'no room for the play field'):
+            compile_config(raw_config(window={'left_buffer': 300, 'right_buffer': 300}))
+
+    def test_scaling_settings(self):
+        with self.assertRaisesRegex(ConfigError, r'^window\.scaling: must be one of'):
+            compile_config(raw_config(window={'scaling': 'stretch'}))
+        with self.assertRaisesRegex(ConfigError, 'display_width and display_height'):
+            compile_config(raw_config(window={'display_width': 1920}))
+        config = compile_config(raw_config(window={'display_width': 1920, 'display_height': 1080}))
+        self.assertEqual(config.window.display_size, (1920, 1080))
+
+    def test_play_field_contains_its_edges(self):
+        field = compile_config(raw_config()).play_field
+        self.assertTrue(field.contains(field.left, field.bottom))
+        self.assertFalse(field.contains(field.left - 1, field.top))
+        self.assertFalse(field.contains(field.right, field.bottom + 1))
+
+    def test_speeds_scale_with_the_clock_step(self):
+        config = compile_config(raw_config(player={'vel': 15}, clock={'step_ms': 50}))
+        self.assertEqual(config.player_vel, 15)
+        self.assertIsInstance(config.player_vel, int)
+        config = compile_config(raw_config(player={'vel': 15}, clock={'step_ms': 16}))
+        self.assertAlmostEqual(config.player_vel * 1000 / 16, 15 * 1000 / 50)
@@ -0,0 +1,48 @@
+import unittest
+
+from src.entity_store import np, EntityStore, PLAYER_BULLET, ENEMY_BULLET, StoreColumn
+
+
+class Stored:
+    y = StoreColumn('y')
+    vel = StoreColumn('vel')
+
+    def __init__(self, store, kind, y, vel, heading):
+        self.store = store
+        self.slot = store.allocate(self, kind)
+        store.activate(self.slot, heading)
+        self.y = y
+        self.vel = vel
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestEntityStore(unittest.TestCase):
+
+    def test_step_moves_along_heading(self):
+        store = EntityStore(4)
+        up = Stored(store, PLAYER_BULLET, 100, 10, -1)
+        down = Stored(store, ENEMY_BULLET, 100, 5, 1)
+        store.step()
+        self.assertEqual(up.y, 90)
+        self.assertEqual(down.y, 105)
+
+    def test_deactivated_entities_stay_put_and_are_not_offscreen(self):
+        store = EntityStore(4)
+        bullet = Stored(store, PLAYER_BULLET, -50, 10, -1)
+        self.assertEqual(store.offscreen(0, 100, 0, 100), [bullet])
+        store.deactivate(bullet.slot)
+        store.step()
+        self.assertEqual(bullet.y, -50)
+        self.assertEqual(store.offscreen(0, 100, 0, 100), [])
+
+    def test_grows_and_reuses_freed_slots(self):
+        store = EntityStore(2)
+        bullets = [Stored(store, ENEMY_BULLET, i, 1, 1) for i in range(3)]
+        self.assertEqual(store.capacity, 4)
+        self.assertEqual([b.y for b in bullets], [0, 1, 2])
+        store.free(bullets[1].slot)
+        self.assertEqual(Stored(store, ENEMY_BULLET, 0, 1, 1).slot, bullets[1].slot)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from src.env import np, OBS_SIZE, PLAYER_FIELDS, SpaceInvadersEnv, VectorEnv
+from src.inputs import SHOOT
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestSpaceInvadersEnv(unittest.TestCase):
+    def test_reset_observes_player_and_enemies(self):
+        obs = SpaceInvadersEnv(seed=0).reset()
+        self.assertEqual(obs.shape, (OBS_SIZE,))
+        self.assertEqual(obs[0], 1)  # player present
+        self.assertEqual(obs[PLAYER_FIELDS], 1)  # first enemy slot used
+
+    def test_reward_is_points_gained_and_episode_truncates(self):
+        env = SpaceInvadersEnv(max_ticks=200, seed=0)
+        env.reset()
+        total, done, ticks = 0, False, 0
+        while not done:
+            _, reward, done, info = env.step(SHOOT)
+            total += reward
+            ticks += 1
+        self.assertEqual(total, info['points'])
+        self.assertLessEqual(ticks, 200)
+
+    def test_same_seed_and_actions_give_same_observations(self):
+        a, b = SpaceInvadersEnv(), SpaceInvadersEnv()
+        a.reset(seed=3)
+        b.reset(seed=3)
+        for tick in range(100):
+            action = tick % 8
+            self.assertTrue(np.array_equal(a.step(action)[0], b.step(action)[0]))
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestVectorEnv(unittest.TestCase):
+    def test_matches_single_envs(self):
+        with VectorEnv(2, processes=1) as venv:
+            observations = venv.reset(seeds=[1, 2])
+            singles = [SpaceInvadersEnv(), SpaceInvadersEnv()]
+            for env, seed, obs in zip(singles, (1, 2), observations):
+                self.assertTrue(np.array_equal(env.reset(seed=seed), obs))
+            for _ in range(20):
+                observations, _, _, _ = venv.step([SHOOT, 0])
+                for env, action, obs in zip(singles, (SHOOT, 0), observations):
+                    self.assertTrue(np.array_equal(env.step(action)[0], obs))
+
+    def test_envs_split_across_processes(self):
+        with VectorEnv(3, processes=2) as venv:
+            self.assertEqual(len(venv.workers), 2)
+            observations = venv.reset(seeds=[1, 2, 3])
+            singles = [SpaceInvadersEnv() for _ in range(3)]
+            for env, seed, obs in zip(singles, (1, 2, 3), observations):
+                self.assertTrue(np.array_equal(env.reset(seed=seed), obs))
+            actions = [SHOOT, 0, SHOOT]
+            for _ in range(20):
+                observations, rewards, _, _ = venv.step(actions)
+                for env, action, obs, reward in zip(singles, actions, observations, rewards):
+                    single_obs, single_reward, _, _ = env.step(action)
+                    self.assertTrue(np.array_equal(single_obs, obs))
+                    self.assertEqual(single_reward, reward)
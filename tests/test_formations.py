@@ -0,0 +1,36 @@
+import unittest
+from types import SimpleNamespace
+
+from src.formations import Formation
+
+
+def enemy(id, x, y):
+    return SimpleNamespace(id=id, grid_x=x, grid_y=y, formation=None)
+
+
+class TestFormation(unittest.TestCase):
+    def setUp(self):
+        # three columns at x = 20, 50, 80 with radius 10, in a 0-120 wide field
+        self.formation = Formation(vel=10, radius=10, min_x=10, max_x=120, move_recoil=0)
+        self.enemies = [enemy(i, x, 20) for i, x in enumerate((20, 50, 80))]
+        for e in self.enemies:
+            self.formation.add(e)
+
+    def test_moves_until_edge_then_drops_and_turns(self):
+        for _ in range(3):
+            self.formation.move()
+        self.assertEqual((self.formation.offset_x, self.formation.offset_y), (30, 0))
+
+        self.formation.move()
+        self.assertEqual((self.formation.offset_x, self.formation.offset_y), (30, 10))
+        self.assertEqual(self.formation.direction, -1)
+
+    def test_turns_on_surviving_columns(self):
+        self.formation.remove(self.enemies[2])
+        for _ in range(6):
+            self.formation.move()
+        self.assertEqual((self.formation.offset_x, self.formation.offset_y), (60, 0))
+
+    def test_lowest_y_follows_offset(self):
+        self.formation.offset_y = 15
+        self.assertEqual(self.formation.lowest_y, 35)
@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from simulate import random_inputs  # noqa: E402
+from src.game import Game  # noqa: E402
+from src.inputs import ScriptedInput  # noqa: E402
+
+
+class TestHeadlessSimulation(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(headless=True)
+
+    def simulate(self, seed, ticks=5000, max_ticks=None):
+        inputs = ScriptedInput(random_inputs(random.Random(seed), ticks))
+        meta = self.game.simulate(inputs, max_ticks=max_ticks, seed=seed)
+        return meta.points, meta.lives, meta.won_state, meta.lost_state
+
+    def test_plays_to_the_end_without_a_window(self):
+        result = self.simulate(seed=1)
+        self.assertIsNone(pygame.display.get_surface())
+        self.assertFalse(self.game.game_meta.game_being_played)
+        self.assertTrue(result[2] or result[3])
+
+    def test_same_seed_and_input_give_the_same_game(self):
+        self.assertEqual(self.simulate(seed=2), self.simulate(seed=2))
+
+    def test_stops_when_input_runs_out_or_at_max_ticks(self):
+        screen = pygame.Surface(self.game.config.window.size)
+        handler = self.game.start_simulation(
+            screen, ScriptedInput(random_inputs(random.Random(3), 40)), seed=3)
+        self.assertEqual(self.game.run_simulation(handler, max_ticks=25), 25)
+        self.assertEqual(self.game.run_simulation(handler), 16)  # 15 left, then one to find the end
+        self.assertTrue(handler.input_source.exhausted)
+        self.assertTrue(self.game.game_meta.game_being_played)
@@ -0,0 +1,64 @@
+import random
+import unittest
+from types import SimpleNamespace
+
+from src.helpers import (
+    detect_collision,
+    detect_collisions_batch,
+    distance_between_objects,
+    np,
+    squared_distances_batch,
+)
+
+
+def random_circles(rng, n, max_radius):
+    return [
+        SimpleNamespace(x=rng.randint(0, 100), y=rng.randint(0, 100),
+                        radius=rng.randint(1, max_radius))
+        for _ in range(n)
+    ]
+
+
+def columns(objs):
+    return ([o.x for o in objs], [o.y for o in objs], [o.radius for o in objs])
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class TestDetectCollisionsBatch(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.group1 = random_circles(rng, 40, 15)
+        self.group2 = random_circles(rng, 60, 5)
+
+    def test_matches_scalar_detect_collision(self):
+        i, j = detect_collisions_batch(*columns(self.group1), *columns(self.group2))
+        expected = [
+            (a, b)
+            for a, obj1 in enumerate(self.group1)
+            for b, obj2 in enumerate(self.group2)
+            if detect_collision(obj1, obj2)
+        ]
+        self.assertEqual(list(zip(i.tolist(), j.tolist())), expected)
+
+    def test_touching_circles_collide(self):
+        i, j = detect_collisions_batch([0], [0], [3], [3, 4], [4, 4], [2, 2])
+        self.assertEqual(list(zip(i.tolist(), j.tolist())), [(0, 0)])
+
+    def test_empty_group(self):
+        i, j = detect_collisions_batch([1, 2], [1, 2], [1, 1], [], [], [])
+        self.assertEqual(len(i), 0)
+        self.assertEqual(len(j), 0)
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class TestSquaredDistancesBatch(unittest.TestCase):
+    def test_matches_scalar_distance(self):
+        rng = random.Random(1)
+        group1 = random_circles(rng, 10, 1)
+        group2 = random_circles(rng, 12, 1)
+        dist_sq = squared_distances_batch(
+            *columns(group1)[:2], *columns(group2)[:2])
+        for a, obj1 in enumerate(group1):
+            for b, obj2 in enumerate(group2):
+                self.assertAlmostEqual(
+                    dist_sq[a, b], distance_between_objects(obj1, obj2)**2)
@@ -0,0 +1,72 @@
+import unittest
+
+from src.inputs import (
+    QUIT,
+    InputLog,
+    InputRecorder,
+    InputState,
+    RecordedInput,
+    ScriptedInput,
+    input_to_mask,
+    mask_to_input,
+)
+
+LEFT_AND_SHOOT = InputState(True, False, True)
+
+
+class TestInputMask(unittest.TestCase):
+    def test_round_trip(self):
+        self.assertEqual(mask_to_input(input_to_mask(LEFT_AND_SHOOT)), LEFT_AND_SHOOT)
+
+
+class TestInputLog(unittest.TestCase):
+    def test_repeated_masks_share_a_run(self):
+        log = InputLog(seed=1)
+        for mask in (0, 0, 0, 5, 5, 0):
+            log.append(mask)
+        self.assertEqual(log.runs, [[0, 3], [5, 2], [0, 1]])
+        self.assertEqual(log.tick_count, 6)
+
+    def test_bytes_round_trip(self):
+        log = InputLog(seed=42)
+        for mask in (1, 1, 2, 4, 4, 4):
+            log.append(mask)
+        loaded = InputLog.from_bytes(log.to_bytes())
+        self.assertEqual(loaded.seed, 42)
+        self.assertEqual(list(loaded.masks()), [1, 1, 2, 4, 4, 4])
+
+    def test_masks_from_tick(self):
+        log = InputLog(seed=1)
+        for mask in (1, 1, 2, 4, 4, 4):
+            log.append(mask)
+        self.assertEqual(list(log.masks(start_tick=3)), [4, 4, 4])
+        self.assertEqual(list(log.masks(start_tick=1)), [1, 2, 4, 4, 4])
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            InputLog.from_bytes(b'x' * InputLog.HEADER.size)
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    def test_replay_matches_recording(self):
+        states = [LEFT_AND_SHOOT, LEFT_AND_SHOOT, InputState(False, True, False)]
+        recorder = InputRecorder(ScriptedInput(states), seed=3)
+        recorded = [recorder.read() for _ in states]
+
+        replay = RecordedInput(recorder.log)
+        self.assertEqual([replay.read() for _ in states], recorded)
+        replay.read()
+        self.assertTrue(replay.exhausted)
+
+    def test_replay_stops_after_quit(self):
+        recorder = InputRecorder(ScriptedInput([LEFT_AND_SHOOT] * 3), seed=3)
+        recorder.read()
+        recorder.record_quit()
+        recorder.read()
+        self.assertEqual(recorder.log.runs[-1][0] & QUIT, QUIT)
+
+        replay = RecordedInput(recorder.log)
+        replay.read()
+        self.assertFalse(replay.exhausted)
+        self.assertEqual(replay.read(), LEFT_AND_SHOOT)
+        self.assertTrue(replay.exhausted)
@@ -0,0 +1,120 @@
+import threading
+import unittest
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+from src.inputs import InputState, NO_INPUT  # noqa: E402
+from src.game_meta import GameMeta  # noqa: E402
+from src.net import (  # noqa: E402
+    ENEMY,
+    MAX_DATAGRAM,
+    PLAYER_BULLET,
+    SHOOTING_ENEMY,
+    GameClient,
+    GameServer,
+    capture_state,
+    decode_snapshot,
+    encode_snapshot,
+)
+
+LEFT = InputState(True, False, False)
+RIGHT = InputState(False, True, False)
+
+
+class TestGameServer(unittest.TestCase):
+    def setUp(self):
+        self.server = GameServer(seed=0)
+        self.clients = [GameClient(self.server.address) for _ in range(2)]
+        for client in self.clients:
+            client.hello()
+        self.server.step()
+        for client in self.clients:
+            client.poll()
+
+    def tearDown(self):
+        self.server.close()
+
+    def step(self, *states):
+        for client, state in zip(self.clients, states):
+            client.send_input(state)
+        self.server.step()
+        for client in self.clients:
+            client.poll()
+
+    def test_each_client_controls_its_own_player(self):
+        a, b = self.clients
+        self.assertNotEqual(a.player_id, b.player_id)
+        start = {id: x for id, _, x, _ in a.positions()}
+        for _ in range(3):
+            self.step(LEFT, RIGHT)
+        now = {id: x for id, _, x, _ in a.positions()}
+        self.assertLess(now[a.player_id], start[a.player_id])
+        self.assertGreater(now[b.player_id], start[b.player_id])
+
+    def test_clients_rebuild_the_server_state(self):
+        for tick in range(60):
+            self.step(RIGHT, InputState(False, False, tick % 2 == 0))
+        expected = capture_state(self.server.screen_handler)
+        for client in self.clients:
+            self.assertEqual(client.tick, self.server.tick)
+            self.assertEqual(client.entities, expected)
+
+    def test_acknowledged_snapshots_leave_out_unchanged_enemies(self):
+        client = self.clients[0]
+        sent = []
+        handle_snapshot = client.handle_snapshot
+        client.handle_snapshot = lambda data: sent.append(data) or handle_snapshot(data)
+        for _ in range(5):
+            self.step(NO_INPUT, NO_INPUT)
+        _, base_tick, _, _, updates, _ = decode_snapshot(sent[-1])
+        self.assertNotEqual(base_tick, 0)
+        self.assertFalse([id for id, (kind, *_) in updates if kind in (ENEMY, SHOOTING_ENEMY)])
+
+    def test_leaving_removes_the_player(self):
+        self.clients[1].leave()
+        self.server.step()
+        self.assertEqual(len(self.server.clients), 1)
+        self.assertEqual(len(self.server.screen_handler.players), 1)
+
+
+class TestSplitSnapshots(unittest.TestCase):
+    def test_large_snapshot_is_split_and_reassembled(self):
+        state = {id: (PLAYER_BULLET, 0, id % 500, id % 300) for id in range(1, 8001)}
+        parts = encode_snapshot(1, 0, GameMeta(3, 0), list(state.items()), [])
+        self.assertGreater(len(parts), 1)
+        self.assertTrue(all(len(part) <= MAX_DATAGRAM for part in parts))
+
+        client = GameClient(('127.0.0.1', 9))
+        try:
+            for part in reversed(parts[1:]):
+                self.assertFalse(client.handle_snapshot(part))
+            self.assertTrue(client.handle_snapshot(parts[0]))
+            self.assertEqual(client.entities, state)
+            self.assertEqual(client.partial, {})
+        finally:
+            client.sock.close()
+
+    def test_removals_split_too(self):
+        parts = encode_snapshot(2, 1, GameMeta(3, 0), [], list(range(100)), max_size=100)
+        removed = [id for part in parts for id in decode_snapshot(part)[5]]
+        self.assertEqual(removed, list(range(100)))
+
+
+class TestJoinAcrossThreads(unittest.TestCase):
+    def test_blocking_join(self):
+        server = GameServer()
+        stop = threading.Event()
+        thread = threading.Thread(target=server.serve_forever, args=(stop.is_set,))
+        thread.start()
+        try:
+            self.assertIsNotNone(GameClient(server.address).join())
+        finally:
+            stop.set()
+            thread.join()
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
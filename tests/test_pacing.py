@@ -0,0 +1,99 @@
+import unittest
+
+from src.pacing import FixedStep, FramePacer, LatencyTracker
+
+
+class FakeClock:
+    """Time that only moves when slept through, or by `spin` per reading."""
+
+    def __init__(self, spin=0.0001):
+        self.now = 100.0
+        self.spin = spin
+        self.sleeps = []
+
+    def __call__(self):
+        self.now += self.spin
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestFramePacer(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def pacer(self, period_ms=10, spin_ms=1):
+        return FramePacer(period_ms, spin_ms, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_sleeps_then_spins_to_the_deadline(self):
+        pacer = self.pacer()
+        start = self.clock.now
+        pacer.wait()
+        self.assertAlmostEqual(self.clock.sleeps[0], 0.009, places=3)
+        self.assertAlmostEqual(self.clock.now - start, 0.010, places=3)
+        self.assertGreaterEqual(self.clock.now, pacer.deadline)
+
+    def test_slow_frame_is_made_up_by_the_next(self):
+        pacer = self.pacer()
+        start = self.clock.now
+        pacer.wait()
+        self.clock.now += 0.015  # a slow frame
+        pacer.wait()
+        self.assertEqual(pacer.late_frames, 1)
+        pacer.wait()
+        pacer.wait()
+        self.assertAlmostEqual(self.clock.now - start, 0.040, places=3)
+
+    def test_resyncs_after_a_long_stall(self):
+        pacer = self.pacer()
+        pacer.wait()
+        self.clock.now += 0.050
+        pacer.wait()
+        before = self.clock.now
+        pacer.wait()
+        self.assertAlmostEqual(self.clock.now - before, 0.010, places=3)
+
+
+class TestFixedStep(unittest.TestCase):
+    def test_steps_follow_real_time(self):
+        clock = FakeClock(spin=0)
+        steps = FixedStep(step_ms=50, clock=clock)
+        due = [steps.steps_due()]
+        for _ in range(12):  # 60 fps frames
+            clock.now += 1 / 60
+            due.append(steps.steps_due())
+        self.assertEqual(due[0], 1)
+        self.assertEqual(sum(due[1:]), 4)
+        self.assertEqual(max(due[1:]), 1)
+
+    def test_owes_at_most_max_steps_after_a_stall(self):
+        clock = FakeClock(spin=0)
+        steps = FixedStep(step_ms=50, max_steps=3, clock=clock)
+        steps.steps_due()
+        clock.now += 10
+        self.assertEqual(steps.steps_due(), 3)
+        clock.now += 0.05
+        self.assertEqual(steps.steps_due(), 1)
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_measures_from_the_consumed_sample(self):
+        clock = FakeClock(spin=0)
+        latency = LatencyTracker(clock=clock)
+        for frame in range(6):
+            latency.input_sampled()
+            if frame % 3 == 0:  # a tick every third frame
+                latency.input_consumed()
+            clock.now += 0.002
+            latency.presented()
+            clock.now += 0.014
+        self.assertEqual([round(ms) for ms in latency.latency], [2, 2])
+        self.assertEqual([round(ms) for ms in latency.interval], [48])
+
+    def test_percentiles_by_nearest_rank(self):
+        latency = LatencyTracker()
+        self.assertEqual(latency.percentiles(), {'latency': {}, 'interval': {}})
+        latency.latency.extend(range(1, 101))
+        self.assertEqual(latency.percentiles()['latency'], {'p50': 51, 'p95': 95, 'p99': 99})
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from src.profiler import NULL_PROFILER, FrameProfiler  # noqa: E402
+from src.screen_objects import ProfilerOverlay  # noqa: E402
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def update_state(self, *args):
+        self.calls += 1
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def play_frame(self, profiler):
+        profiler.begin_frame()
+        with profiler.phase('update'):
+            pass
+        with profiler.phase('update'):
+            pass
+        profiler.time_each([Counter(), Counter()], 'update_state')
+        profiler.end_frame({'enemies': 3})
+
+    def test_phase_totals_per_frame(self):
+        profiler = FrameProfiler()
+        self.play_frame(profiler)
+        self.assertEqual(set(profiler.last_frame), {'update', 'update_state:Counter'})
+        self.assertGreaterEqual(profiler.frame_ms, profiler.last_frame['update'])
+        self.assertEqual(profiler.counts, {'enemies': 3})
+
+    def test_exports_chrome_trace(self):
+        profiler = FrameProfiler()
+        self.play_frame(profiler)
+        path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+        profiler.export_trace(path)
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        self.assertEqual([(e['name'], e['ph']) for e in events], [
+            ('update', 'X'), ('update', 'X'), ('update_state', 'C'), ('frame', 'X'), ('entities', 'C'),
+        ])
+
+    def test_null_profiler_shares_one_context(self):
+        self.assertIs(NULL_PROFILER.phase('a'), NULL_PROFILER.phase('b'))
+        counter = Counter()
+        NULL_PROFILER.time_each([counter], 'update_state')
+        self.assertEqual(counter.calls, 1)
+
+
+class TestProfilerOverlay(unittest.TestCase):
+    def test_shows_last_frame(self):
+        pygame.font.init()
+        profiler = SimpleNamespace(last_frame={'update': 1.25, 'draw': 2.0}, frame_ms=12.5,
+                                   counts={'enemies': 7, 'player_bullets': 1, 'enemy_bullets': 2})
+        window = pygame.Surface((200, 100))
+        overlay = ProfilerOverlay(profiler, 5, 5, window, id=1)
+        overlay.update_state(None)
+        self.assertEqual(len(overlay.lines), 4)
+        overlay.draw()
+        self.assertNotEqual(pygame.transform.average_color(window)[:3], (0, 0, 0))
@@ -0,0 +1,107 @@
+import random
+import unittest
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from simulate import random_inputs  # noqa: E402
+from src.game import Game  # noqa: E402
+from src.inputs import ScriptedInput  # noqa: E402
+from src.render import DirtyRectRenderer, FullRenderer, ScaledRenderer  # noqa: E402
+
+
+class TestScaledRenderer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        use_dummy_drivers()
+        pygame.display.init()
+        cls.display = pygame.display.set_mode((250, 120))
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def scaled(self, size, smooth=False):
+        screen = pygame.Surface(size)
+        bg = pygame.Surface(size)
+        return ScaledRenderer(FullRenderer(screen, bg), self.display, smooth=smooth)
+
+    def test_integer_scaling_is_centred_whole_pixels(self):
+        renderer = self.scaled((100, 50))
+        self.assertEqual(renderer.target_rect, pygame.Rect(25, 10, 200, 100))
+        renderer.source.set_at((3, 4), (255, 0, 0))
+        renderer.present()
+        for dx in (0, 1):
+            for dy in (0, 1):
+                self.assertEqual(self.display.get_at((25 + 6 + dx, 10 + 8 + dy)), (255, 0, 0))
+        self.assertEqual(self.display.get_at((25 + 8, 10 + 8)), (0, 0, 0))
+
+    def test_smooth_scaling_fills_the_display_height(self):
+        renderer = self.scaled((100, 50), smooth=True)
+        self.assertEqual(renderer.target_rect.size, (240, 120))
+
+    def test_shrinks_when_the_display_is_smaller(self):
+        renderer = self.scaled((500, 240))
+        self.assertEqual(renderer.target_rect.size, (250, 120))
+
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    def start(self, game, renderer_cls, inputs):
+        screen = pygame.Surface(game.config.window.size)
+        handler = game.start_simulation(screen, ScriptedInput(inputs), seed=3)
+        handler.renderer = renderer_cls(screen, handler.bg)
+        handler.render = True
+        return handler
+
+    def test_frames_match_full_redraw(self):
+        game = Game(headless=True)
+        inputs = list(random_inputs(random.Random(3), 400))
+        full = self.start(game, FullRenderer, inputs)
+        dirty = self.start(game, DirtyRectRenderer, inputs)
+        for tick in range(400):
+            full.update_screen_state()
+            dirty.update_screen_state()
+            self.assertEqual(pygame.image.tobytes(dirty.screen, 'RGB'),
+                             pygame.image.tobytes(full.screen, 'RGB'), f'tick {tick}')
+
+    def test_overlaps_spread_along_a_chain(self):
+        screen = pygame.Surface((200, 50))
+        renderer = DirtyRectRenderer(screen, pygame.Surface((200, 50)))
+        boxes = [Box(i, pygame.Rect(10 * i, 10, 15, 15)) for i in range(10)]
+        renderer.draw(boxes)
+        for box in boxes:
+            box.drawn = 0
+        boxes[0].rect = boxes[0].rect.move(0, 1)
+        renderer.draw(boxes)
+        self.assertEqual([box.drawn for box in boxes], [1] * 10)
+
+    def test_too_many_changes_redraw_everything(self):
+        screen = pygame.Surface((500, 500))
+        renderer = DirtyRectRenderer(screen, pygame.Surface((500, 500)))
+        boxes = [Box(i, pygame.Rect(20 * (i % 20), 20 * (i // 20), 5, 5)) for i in range(300)]
+        renderer.draw(boxes)
+        boxes[0].rect.x += 1
+        renderer.draw(boxes)
+        self.assertEqual(len(renderer.dirty_rects), 2)
+        for box in boxes:
+            box.rect.x += 1
+        renderer.draw(boxes)
+        self.assertIsNone(renderer.dirty_rects)
+
+
+class Box:
+    always_redraw = False
+
+    def __init__(self, id, rect):
+        self.id = id
+        self.rect = rect
+        self.drawn = 0
+
+    def get_rect(self):
+        return self.rect.copy()
+
+    def draw(self):
+        self.drawn += 1
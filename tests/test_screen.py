@@ -0,0 +1,54 @@
+import itertools
+import unittest
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from src.game import Game  # noqa: E402
+from src.inputs import NO_INPUT, ScriptedInput  # noqa: E402
+from src.screen import INDEXED_TYPES  # noqa: E402
+from src.screen_objects import Enemy, EnemyBullet, Player, PlayerBullet  # noqa: E402
+
+
+class TestRegistries(unittest.TestCase):
+    def setUp(self):
+        game = Game(headless=True)
+        screen = pygame.Surface(game.config.window.size)
+        self.handler = game.start_simulation(screen, ScriptedInput(itertools.repeat(NO_INPUT)), 1)
+
+    def assert_in_sync(self):
+        handler = self.handler
+        for cls in INDEXED_TYPES:
+            expected = {id: obj for id, obj in handler.screen_objects.items() if isinstance(obj, cls)}
+            self.assertEqual(handler.indexes[cls], expected, cls.__name__)
+        expected = {id: obj for id, obj in handler.screen_objects.items() if obj.update_each_tick}
+        self.assertEqual(handler.updatable, expected)
+
+    def test_register_and_remove_keep_registries_in_sync(self):
+        handler = self.handler
+        factory = handler.screen_object_factory
+        self.assert_in_sync()
+
+        bullet = factory.create_player_bullet(100, 100, 5, 3)
+        enemy_bullet = factory.create_enemy_bullet(100, 100, 5, 3)
+        player = factory.create_player(200, 400, 5, 10)
+        self.assert_in_sync()
+        self.assertIn(bullet.id, handler.indexes[PlayerBullet])
+        self.assertIn(enemy_bullet.id, handler.indexes[EnemyBullet])
+        self.assertIn(player.id, handler.indexes[Player])
+
+        enemy = next(iter(handler.enemies))
+        self.assertNotIn(enemy.id, handler.updatable)  # moved by its formation
+        for obj in (enemy, bullet, enemy_bullet, player):
+            handler.remove_screen_object(obj)
+            self.assertNotIn(obj.id, handler.screen_objects)
+            self.assert_in_sync()
+        self.assertNotIn(enemy.id, handler.indexes[Enemy])
+
+    def test_clear_empties_every_registry(self):
+        self.handler.clear_objects_from_screen()
+        self.assertFalse(self.handler.screen_objects)
+        self.assert_in_sync()
@@ -0,0 +1,116 @@
+import itertools
+import unittest
+from unittest import mock
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from src.game import Game  # noqa: E402
+from src.inputs import InputState, NO_INPUT, ScriptedInput  # noqa: E402
+from src.screen_objects import EnemyBullet, PlayerBullet  # noqa: E402
+
+
+class TestBulletPool(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(headless=True)
+        self.screen = pygame.Surface(self.game.config.window.size)
+
+    def start(self, input_state=NO_INPUT):
+        return self.game.start_simulation(
+            self.screen, ScriptedInput(itertools.repeat(input_state)), seed=5)
+
+    def test_released_bullet_is_reused_with_a_fresh_id(self):
+        handler = self.start()
+        factory = handler.screen_object_factory
+        bullet = factory.create_player_bullet(100, 100, 5, 3)
+        old_id = bullet.id
+        handler.remove_screen_object(bullet)
+        self.assertIn(bullet, factory.bullet_pools[PlayerBullet])
+
+        reused = factory.create_player_bullet(50, 60, 7, 2)
+        self.assertIs(reused, bullet)
+        self.assertNotEqual(reused.id, old_id)
+        self.assertEqual((reused.x, reused.y, reused.vel, reused.radius), (50, 60, 7, 2))
+        self.assertIs(handler.screen_objects[reused.id], reused)
+
+    def test_pool_is_capped_and_extra_bullets_disposed(self):
+        handler = self.start()
+        factory = handler.screen_object_factory
+        factory.max_pooled_bullets = 1
+        bullets = [factory.create_enemy_bullet(100, 100, 5, 3) for _ in range(3)]
+        with mock.patch.object(EnemyBullet, 'dispose') as dispose:
+            for bullet in bullets:
+                handler.remove_screen_object(bullet)
+        self.assertEqual(len(factory.bullet_pools[EnemyBullet]), 1)
+        self.assertEqual(dispose.call_count, 2)
+
+    def test_only_makes_as_many_bullets_as_are_ever_alive_at_once(self):
+        handler = self.start(InputState(left=False, right=False, shoot=True))
+        kinds = (handler.player_bullets, handler.enemy_bullets)
+        seen = [[], []]  # keeps every bullet alive so identities stay unique
+        peak = [0, 0]
+        for _ in range(600):
+            handler.update_screen_state()
+            for i, bullets in enumerate(kinds):
+                seen[i].extend(bullets)
+                peak[i] = max(peak[i], len(bullets))
+        self.assertTrue(all(peak))
+        self.assertEqual([len({id(bullet) for bullet in bullets}) for bullets in seen], peak)
+
+    def test_bullets_have_no_instance_dict(self):
+        for cls in (PlayerBullet, EnemyBullet):
+            bullet = cls(0, 0, 1, 1, self.screen, id=1)
+            self.assertFalse(hasattr(bullet, '__dict__'))
+
+
+class TestFractionalPositions(unittest.TestCase):
+    def test_drawn_pixels_stay_inside_the_rect(self):
+        window = pygame.Surface((40, 40), pygame.SRCALPHA)
+        for x, y in ((10.5, 10.4), (20.49, 19.51), (15.0, 15.0)):
+            window.fill((0, 0, 0, 0))
+            bullet = PlayerBullet(x, y, 1, 3, window, id=1)
+            bullet.draw()
+            self.assertTrue(bullet.get_rect().contains(window.get_bounding_rect()), (x, y))
+
+
+class TestPlayers(unittest.TestCase):
+    def setUp(self):
+        game = Game(headless=True)
+        screen = pygame.Surface(game.config.window.size)
+        self.handler = game.start_simulation(screen, ScriptedInput(itertools.repeat(NO_INPUT)), 1)
+
+    def test_each_player_has_its_own_bullet_in_flight(self):
+        handler = self.handler
+        first = next(iter(handler.players))
+        second = handler.screen_object_factory.create_player(100, first.y, 5, 10)
+        first.reloaded = second.reloaded = True
+        shoot = InputState(left=False, right=False, shoot=True)
+        handler.player_inputs = {first.id: shoot}
+        first.update_state(handler)
+        self.assertIn(first.bullet_id, handler.indexes[PlayerBullet])
+
+        handler.player_inputs[second.id] = shoot
+        second.update_state(handler)
+        self.assertEqual(len(handler.player_bullets), 2)
+
+        first.reloaded = True
+        first.update_state(handler)  # still has a bullet in flight
+        self.assertEqual(len(handler.player_bullets), 2)
+
+    def test_removing_a_player_cancels_its_reload(self):
+        player = next(iter(self.handler.players))
+        timer = player.reload_timer
+        self.handler.remove_screen_object(player)
+        self.assertTrue(timer.cancelled)
+
+    def test_late_joiner_waits_a_full_recoil(self):
+        handler = self.handler
+        for _ in range(100):
+            handler.update_screen_state()
+        player = handler.screen_object_factory.create_player(100, 500, 5, 10)
+        recoil = handler.config.player.bullet.recoil
+        self.assertEqual(player.reload_timer.due, handler.clock.get_ticks() + recoil)
+        self.assertFalse(player.reloaded)
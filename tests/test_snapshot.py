@@ -0,0 +1,82 @@
+import random
+import unittest
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from simulate import random_inputs  # noqa: E402
+from src.game import Game  # noqa: E402
+from src.inputs import ScriptedInput  # noqa: E402
+from src.screen_objects import Player, ScoreBox  # noqa: E402
+from src.snapshot import restore_state, save_state  # noqa: E402
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(headless=True)
+        self.screen = pygame.Surface(self.game.config.window.size)
+        self.inputs = list(random_inputs(random.Random(0), 600))
+
+    def start(self, inputs, seed=1):
+        return self.game.start_simulation(self.screen, ScriptedInput(inputs), seed)
+
+    def play(self, screen_handler, inputs):
+        screen_handler.input_source = ScriptedInput(inputs)
+        self.game.run_simulation(screen_handler)
+        return save_state(screen_handler)
+
+    def test_restored_game_plays_out_identically(self):
+        handler = self.start(self.inputs[:200])
+        self.game.run_simulation(handler)
+        snapshot = save_state(handler)
+        expected = self.play(handler, self.inputs[200:])
+
+        restore_state(handler, snapshot)
+        self.assertEqual(save_state(handler), snapshot)
+        self.assertEqual(self.play(handler, self.inputs[200:]), expected)
+
+        # and in a different game, as when forking a simulation
+        other = self.start([], seed=2)
+        restore_state(other, snapshot)
+        self.assertEqual(self.play(other, self.inputs[200:]), expected)
+
+    def test_restore_keeps_position_types(self):
+        def position_types(handler):
+            return {obj.id: (type(obj.x), type(obj.y))
+                    for obj in handler.screen_objects.values() if hasattr(obj, 'x')}
+
+        handler = self.start(self.inputs[:200])
+        self.game.run_simulation(handler)
+        before = position_types(handler)
+        restore_state(handler, save_state(handler))
+        self.assertEqual(position_types(handler), before)
+        for obj in handler.screen_objects.values():
+            if isinstance(obj, (Player, ScoreBox)):
+                self.assertEqual(before[obj.id], (int, int))
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            restore_state(self.start([]), b'\0' * 8192)
+
+    def test_snapshot_ignores_cancelled_timers(self):
+        handler = self.start(self.inputs[:50])
+        self.game.run_simulation(handler)
+        shooter = next(enemy for enemy in handler.enemies if enemy.timer is not None)
+        handler.remove_screen_object(shooter)  # its timer stays in the heap, cancelled
+        self.assertTrue(any(timer.cancelled for _, _, timer in handler.timers.heap))
+
+        snapshot = save_state(handler)
+        restore_state(handler, snapshot)
+        self.assertEqual(save_state(handler), snapshot)
+
+    def test_player_keeps_its_bullet_in_flight(self):
+        handler = self.start([])
+        player = next(iter(handler.players))
+        player.reloaded = True
+        player.shoot(handler)
+        bullet_id = player.bullet_id
+        restore_state(handler, save_state(handler))
+        self.assertEqual(next(iter(handler.players)).bullet_id, bullet_id)
@@ -0,0 +1,44 @@
+import unittest
+from collections import Counter
+
+from src.sound import NULL_SOUNDS, SoundDispatcher, create_sound_dispatcher
+
+
+class FakeAssets:
+    def __init__(self):
+        self.played = Counter()
+
+    def sound(self, name):
+        assets = self
+
+        class Sound:
+            def play(self):
+                assets.played[name] += 1
+        return Sound()
+
+
+class TestSoundDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.assets = FakeAssets()
+        self.sounds = SoundDispatcher({'explosion': 10_000, 'shoot': 0}, assets=self.assets)
+
+    def test_duplicates_in_a_frame_play_once(self):
+        for _ in range(5):
+            self.sounds.post('shoot')
+        self.sounds.post('explosion')
+        self.sounds.flush()
+        self.sounds.close()
+        self.assertEqual(self.assets.played, Counter(shoot=1, explosion=1))
+
+    def test_rate_limit_skips_repeats_across_frames(self):
+        for _ in range(3):
+            self.sounds.post('explosion')
+            self.sounds.post('shoot')
+            self.sounds.flush()
+        self.sounds.close()
+        self.assertEqual(self.assets.played, Counter(shoot=3, explosion=1))
+
+    def test_disabled_dispatcher_is_a_no_op(self):
+        self.assertIs(create_sound_dispatcher(enabled=False), NULL_SOUNDS)
+        NULL_SOUNDS.post('explosion')
+        NULL_SOUNDS.flush()
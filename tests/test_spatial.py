@@ -0,0 +1,32 @@
+import unittest
+from types import SimpleNamespace
+
+from src.spatial import SpatialHash
+
+
+def circle(id, x, y, radius):
+    return SimpleNamespace(id=id, x=x, y=y, radius=radius)
+
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        self.grid = SpatialHash(cell_size=24)
+
+    def test_query_finds_object_in_same_cell(self):
+        near = circle(1, 30, 30, 12)
+        self.grid.insert(near)
+        self.assertEqual(list(self.grid.query(circle(2, 35, 35, 3))), [near])
+
+    def test_query_skips_distant_objects(self):
+        self.grid.insert(circle(1, 30, 30, 12))
+        self.assertEqual(list(self.grid.query(circle(2, 300, 300, 3))), [])
+
+    def test_object_spanning_cells_returned_once(self):
+        wide = circle(1, 48, 48, 30)
+        self.grid.insert(wide)
+        self.assertEqual(list(self.grid.query(circle(2, 48, 48, 30))), [wide])
+
+    def test_clear_empties_grid(self):
+        self.grid.insert(circle(1, 30, 30, 12))
+        self.grid.clear()
+        self.assertEqual(list(self.grid.query(circle(2, 30, 30, 12))), [])
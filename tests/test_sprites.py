@@ -0,0 +1,52 @@
+import unittest
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from src.sprites import SpriteCache  # noqa: E402
+
+
+class TestSpriteCache(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.addCleanup(pygame.display.quit)
+        self.sprites = SpriteCache()
+        self.image = pygame.Surface((8, 8), 0, 24)
+
+    def test_same_key_shares_a_sprite(self):
+        sprite = self.sprites.get(self.image, (4, 4))
+        self.assertEqual(sprite.get_size(), (4, 4))
+        self.assertIs(self.sprites.get(self.image, (4, 4)), sprite)
+        self.assertIsNot(self.sprites.get(self.image, (6, 6)), sprite)
+
+    def test_sprites_convert_once_the_display_exists(self):
+        before = self.sprites.get(self.image, (4, 4))
+        self.assertEqual(before.get_bitsize(), 24)
+
+        display = pygame.display.set_mode((10, 10))
+        self.sprites.use_display_format()
+        converted = self.sprites.get(self.image, (4, 4))
+        self.assertEqual(converted.get_bitsize(), display.get_bitsize())
+        self.assertIs(self.sprites.get(self.image, (4, 4)), converted)
+        self.assertEqual(self.sprites.get(self.image, (6, 6)).get_bitsize(), display.get_bitsize())
+
+    def test_alpha_false_drops_per_pixel_alpha(self):
+        pygame.display.set_mode((10, 10))
+        self.sprites.use_display_format()
+        image = pygame.Surface((8, 8), pygame.SRCALPHA)
+        self.assertTrue(self.sprites.get(image, (4, 4)).get_flags() & pygame.SRCALPHA)
+        self.assertFalse(self.sprites.get(image, (4, 4), alpha=False).get_flags() & pygame.SRCALPHA)
+
+    def test_no_conversion_after_the_display_closes(self):
+        pygame.display.set_mode((10, 10))
+        self.sprites.use_display_format()
+        pygame.display.quit()
+        pygame.display.init()
+        self.assertEqual(self.sprites.get(self.image, (4, 4)).get_bitsize(), 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
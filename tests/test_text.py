@@ -0,0 +1,36 @@
+import unittest
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from src.text import get_font, render_text  # noqa: E402
+
+WHITE = (255, 255, 255)
+
+
+class TestTextCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def test_fonts_are_built_once(self):
+        self.assertIs(get_font(None, 20), get_font(None, 20))
+        self.assertIsNot(get_font(None, 20), get_font(None, 21))
+
+    def test_same_text_shares_a_surface(self):
+        self.assertIs(render_text(None, 20, 'Score: 10', WHITE), render_text(None, 20, 'Score: 10', WHITE))
+
+    def test_any_change_renders_a_new_surface(self):
+        surface = render_text(None, 20, 'Score: 10', WHITE)
+        for changed in (render_text(None, 20, 'Score: 20', WHITE),
+                        render_text(None, 20, 'Score: 10', (255, 0, 0)),
+                        render_text(None, 30, 'Score: 10', WHITE)):
+            self.assertIsNot(changed, surface)
+        self.assertGreater(render_text(None, 30, 'Score: 10', WHITE).get_height(), surface.get_height())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from src.timers import TimerQueue
+
+
+class TestTimerQueue(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerQueue()
+        self.fired = []
+
+    def test_fires_only_after_due_time_in_order(self):
+        self.timers.schedule(100, self.fired.append, 'b')
+        self.timers.schedule(50, self.fired.append, 'a')
+        self.timers.schedule(100, self.fired.append, 'c')
+        self.assertEqual(self.timers.fire_expired(50), 0)
+        self.assertEqual(self.timers.fire_expired(101), 3)
+        self.assertEqual(self.fired, ['a', 'b', 'c'])
+
+    def test_cancelled_timers_do_not_fire(self):
+        timer = self.timers.schedule(10, self.fired.append, 'x')
+        timer.cancel()
+        self.assertEqual(self.timers.fire_expired(20), 0)
+        self.assertEqual(self.fired, [])
+
+    def test_callbacks_can_reschedule(self):
+        def repeat(now):
+            self.fired.append(now)
+            self.timers.schedule(now + 10, repeat, now + 10)
+        self.timers.schedule(0, repeat, 0)
+        for now in range(1, 35):
+            self.timers.fire_expired(now)
+        self.assertEqual(self.fired, [0, 10, 20, 30])
@@ -0,0 +1,78 @@
+import itertools
+import unittest
+
+from src.helpers import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame  # noqa: E402
+
+from config.schema import FormationConfig, WavesConfig  # noqa: E402
+from src.game import Game  # noqa: E402
+from src.inputs import NO_INPUT, ScriptedInput  # noqa: E402
+from src.waves import WaveScheduler, iter_waves  # noqa: E402
+
+WAVES = (FormationConfig(nrows=4, ncols=10), FormationConfig(nrows=5, ncols=12))
+
+
+class TestIterWaves(unittest.TestCase):
+    def test_finite_waves(self):
+        waves = iter_waves(WavesConfig(formations=WAVES, endless=False))
+        self.assertEqual(list(waves), list(WAVES))
+
+    def test_endless_waves_cycle(self):
+        waves = iter_waves(WavesConfig(formations=WAVES, endless=True))
+        self.assertEqual(list(itertools.islice(waves, 5)), list(WAVES + WAVES + WAVES[:1]))
+
+
+class TestWaveScheduler(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(headless=True)
+        screen = pygame.Surface(self.game.config.window.size)
+        self.handler = self.game.start_simulation(screen, ScriptedInput(itertools.repeat(NO_INPUT)), 1)
+        small = FormationConfig(nrows=1, ncols=2)
+        self.scheduler = WaveScheduler(
+            iter_waves(WavesConfig(formations=(small, small), endless=False)), delay=1000)
+        self.handler.wave_scheduler = self.scheduler
+        self.clear_enemies()
+        self.scheduler.start_next_wave(self.handler)
+
+    def clear_enemies(self):
+        for enemy in list(self.handler.enemies):
+            self.handler.remove_screen_object(enemy)
+
+    def step(self, ticks=1):
+        for _ in range(ticks):
+            self.handler.update_screen_state()
+
+    def test_next_wave_waits_for_delay(self):
+        self.assertFalse(self.scheduler.finished)
+        self.clear_enemies()
+        self.step()
+        cleared_at = self.handler.clock.get_ticks()
+        self.assertEqual(self.scheduler.next_wave_time, cleared_at + 1000)
+
+        step_ms = self.handler.clock.step_ms
+        self.step(1000 // step_ms - 1)
+        self.assertFalse(self.handler.enemies)
+        self.step()
+        self.assertTrue(self.handler.enemies)
+        self.assertEqual(self.scheduler.wave_number, 2)
+        self.assertTrue(self.scheduler.finished)
+
+    def test_later_wave_waits_a_recoil_before_moving(self):
+        self.clear_enemies()
+        self.step(1000 // self.handler.clock.step_ms + 1)
+        formation = self.handler.formations[-1]
+        self.assertEqual(formation.last_move_time, self.handler.clock.get_ticks())
+        self.step()
+        self.assertEqual((formation.offset_x, formation.offset_y), (0, 0))
+        self.assertEqual(formation.timer.due,
+                         formation.last_move_time + self.game.config.enemy.move_recoil)
+
+    def test_won_only_after_last_wave(self):
+        self.clear_enemies()
+        self.assertIsNone(self.game.check_game_over(self.handler))
+        self.step(1000 // self.handler.clock.step_ms + 1)
+        self.clear_enemies()
+        self.assertEqual(self.game.check_game_over(self.handler), 'YOU WON!')